@@ -106,6 +106,17 @@ class TestModule(unittest.TestCase):
         retrieved_cell = self.module.get_cell("test_cell")
         self.assertEqual(cell, retrieved_cell)
 
+    def test_verilog_text_refreshes_after_pin_connect(self):
+        # Connecting a pin after a render must invalidate the cached text
+        netlist = Netlist()
+        netlist.modules["test_module"] = self.module
+        cell = self.module.add_cell("u1", "sub")
+        pin = cell.add_pin("a")
+        net = self.module.add_net("w1", "wire", 1)
+        self.assertNotIn(".a(w1)", netlist.verilog_text())
+        pin.connect_net(net)
+        self.assertIn(".a(w1)", netlist.verilog_text())
+
 class TestNetlist(unittest.TestCase):
 
     def setUp(self):
@@ -125,6 +136,82 @@ class TestNetlist(unittest.TestCase):
             # Ensure the file is closed and then deleted
             os.unlink(temp_file_path)
 
+    def test_read_file_cache_round_trip(self):
+        # A cached read must yield the same modules as the cold read,
+        # including every module of a multi-module file
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.v',
+                                         delete=False) as f:
+            f.write("module a(input x); endmodule\n"
+                    "module b(output y); endmodule\n")
+            temp_file_path = f.name
+
+        cache_dir = tempfile.mkdtemp()
+        try:
+            self.netlist.cache_dir = cache_dir
+            self.netlist.read_file(temp_file_path)
+            self.assertEqual(set(self.netlist.modules), {'a', 'b'})
+
+            cached_netlist = Netlist()
+            cached_netlist.cache_dir = cache_dir
+            cached_netlist.read_file(temp_file_path)
+            self.assertEqual(set(cached_netlist.modules), {'a', 'b'})
+            self.assertIn('x', cached_netlist.modules['a'].ports)
+            self.assertIn('y', cached_netlist.modules['b'].ports)
+        finally:
+            os.unlink(temp_file_path)
+
+    def test_read_file_cache_replays_defines(self):
+        # A cached file's define side effects must still reach later files
+        tmpdir = tempfile.mkdtemp()
+        cache_dir = tempfile.mkdtemp()
+        file_a = os.path.join(tmpdir, 'a.v')
+        file_b = os.path.join(tmpdir, 'b.v')
+        with open(file_a, 'w') as f:
+            f.write("`define MODE\nmodule a; endmodule\n")
+        with open(file_b, 'w') as f:
+            f.write("`ifdef MODE\nmodule b_mode; endmodule\n"
+                    "`else\nmodule b_plain; endmodule\n`endif\n")
+
+        cold = Netlist()
+        cold.cache_dir = cache_dir
+        cold.read_file(file_a)
+        cold.read_file(file_b)
+        self.assertEqual(set(cold.modules), {'a', 'b_mode'})
+
+        warm = Netlist()
+        warm.cache_dir = cache_dir
+        warm.read_file(file_a)
+        warm.read_file(file_b)
+        self.assertEqual(set(warm.modules), {'a', 'b_mode'})
+
+    def test_read_file_cache_invalidated_by_include_edit(self):
+        # Editing an included header must invalidate the cached parse
+        # even though the top file itself is unchanged
+        tmpdir = tempfile.mkdtemp()
+        cache_dir = tempfile.mkdtemp()
+        header = os.path.join(tmpdir, 'h.vh')
+        top = os.path.join(tmpdir, 'top.v')
+        with open(header, 'w') as f:
+            f.write("module inc_one; endmodule\n")
+        with open(top, 'w') as f:
+            f.write('`include "h.vh"\nmodule top; endmodule\n')
+
+        cold = Netlist()
+        cold.cache_dir = cache_dir
+        cold.preproc.add_include_path(tmpdir)
+        cold.read_file(top)
+        self.assertEqual(set(cold.modules), {'inc_one', 'top'})
+
+        with open(header, 'w') as f:
+            f.write("module inc_two; endmodule\n")
+        os.utime(header, ns=(1, 1))  # force a distinct mtime
+
+        warm = Netlist()
+        warm.cache_dir = cache_dir
+        warm.preproc.add_include_path(tmpdir)
+        warm.read_file(top)
+        self.assertEqual(set(warm.modules), {'inc_two', 'top'})
+
     def test_link(self):
         module1 = Module("module1")
         module2 = Module("module2")
@@ -23,6 +23,17 @@ class TestParser(unittest.TestCase):
         # print("***",tokens[0].type)
         # print("***",TokenType.KEYWORD)
         self.assertGreater(len(tokens), 0)
+        self.assertEqual(tokens[0].value, 'module')
+
+    def test_tokenize_with_trivia(self):
+        text = """
+        module test(input a, output b);
+            wire c;
+            assign c = a | b;
+        endmodule
+        """
+        tokens = self.parser.tokenize_with_trivia(text)
+        self.assertGreater(len(tokens), 0)
         self.assertEqual(tokens[0].type, TokenType.NEWLINE)
         self.assertEqual(tokens[2].value, 'module')
 
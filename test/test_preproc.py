@@ -8,6 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from verilog_python import Preproc  # Replace 'your_module' with the actual module name
+from verilog_python.preproc import _CondFrame
 
 class TestPreproc(unittest.TestCase):
 
@@ -84,31 +85,31 @@ class TestPreproc(unittest.TestCase):
         line = "`ifdef TEST"
         result = self.preproc._handle_ifdef(line, 1, "test_file")
         self.assertIsNone(result)
-        self.assertTrue(self.preproc.conditional_stack[-1]['active'])
+        self.assertTrue(self.preproc.conditional_stack[-1].active)
 
     def test_handle_ifndef(self):
         line = "`ifndef TEST"
         result = self.preproc._handle_ifndef(line, 1, "test_file")
         self.assertIsNone(result)
-        self.assertTrue(self.preproc.conditional_stack[-1]['active'])
+        self.assertTrue(self.preproc.conditional_stack[-1].active)
 
     def test_handle_else(self):
-        self.preproc.conditional_stack.append({'type': 'ifdef', 'active': False, 'had_else': False})
+        self.preproc.conditional_stack.append(_CondFrame('ifdef', False))
         line = "`else"
         result = self.preproc._handle_else(line, 1, "test_file")
         self.assertIsNone(result)
-        self.assertTrue(self.preproc.conditional_stack[-1]['active'])
+        self.assertTrue(self.preproc.conditional_stack[-1].active)
 
     def test_handle_elsif(self):
-        self.preproc.conditional_stack.append({'type': 'ifdef', 'active': False, 'had_else': False})
+        self.preproc.conditional_stack.append(_CondFrame('ifdef', False))
         self.preproc.defines["TEST"] = "1"
         line = "`elsif TEST"
         result = self.preproc._handle_elsif(line, 1, "test_file")
         self.assertIsNone(result)
-        self.assertTrue(self.preproc.conditional_stack[-1]['active'])
+        self.assertTrue(self.preproc.conditional_stack[-1].active)
 
     def test_handle_endif(self):
-        self.preproc.conditional_stack.append({'type': 'ifdef', 'active': True, 'had_else': False})
+        self.preproc.conditional_stack.append(_CondFrame('ifdef', True))
         line = "`endif"
         result = self.preproc._handle_endif(line, 1, "test_file")
         self.assertIsNone(result)
@@ -15,25 +15,14 @@ Main components:
 __version__ = '1.0.0'
 
 from .language import Language
-
 from .preproc import Preproc
-
 from .getopt import Getopt
+from .parser import Parser, SigParser, TokenType, Token, TokenStream
+from .netlist import Netlist, Net, Port, Pin, Cell, Module
 
-from .parser import Parser
-from .parser import SigParser
-from .parser import TokenType
-from .parser import Token
-
-from .netlist import Netlist
-from .netlist import Net
-from .netlist import Port
-from .netlist import Pin
-from .netlist import Cell
-from .netlist import Module
-
-
-
+# Compile any optional JIT kernels up front so first use is hot
+from ._jit import warmup as _jit_warmup
+_jit_warmup()
 
 __all__ = [
     'Language',
@@ -0,0 +1,35 @@
+"""
+Shared numba integration for optional JIT-compiled helpers.
+
+numba is an optional accelerator: when it is installed (and not disabled
+via NUMBA_DISABLE_JIT, e.g. for coverage runs) kernels decorated with
+njit below are compiled in nopython mode with on-disk caching, so the
+compilation cost is paid once per machine rather than once per process.
+Without numba the decorator is a no-op and the kernels run as plain
+Python.
+"""
+
+import os
+
+try:
+    if os.environ.get('NUMBA_DISABLE_JIT'):
+        raise ImportError
+    from numba import njit as _numba_njit
+except ImportError:
+    _numba_njit = None
+
+
+def njit(**kwargs):
+    """Return numba.njit with cache=True defaulted, or a no-op decorator"""
+    if _numba_njit is None:
+        return lambda func: func
+    kwargs.setdefault('cache', True)
+    return _numba_njit(**kwargs)
+
+
+def warmup() -> None:
+    """Run each jitted kernel on a tiny input so the first real call is hot"""
+    if _numba_njit is None:
+        return
+    from .language import _scan_sized_number
+    _scan_sized_number(b"1'b0")
@@ -5,11 +5,21 @@ This module provides command line option parsing and file handling for
 Verilog tools, similar to the behavior of commercial Verilog tools.
 """
 
+import fnmatch
+import functools
+import mmap
+import os
 import sys
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=4096)
+def _stat_exists(path: str) -> bool:
+    """os.path.exists with the result cached per unique path"""
+    return os.path.exists(path)
+
+
 class Getopt:
     """Command line option handling for Verilog tools"""
     
@@ -21,74 +31,60 @@ class Getopt:
         self.files = []             # Input files
         self.depend_files = []      # Files for dependency tracking
         self.options = {}           # Other options
+        self._dir_cache = {}        # Directory listings for pattern expansion
         
-        # Common Verilog tool options
-        self.option_patterns = {
-            '-D'        : self._handle_define,
-            '-I'        : self._handle_include,
-            '-f'        : self._handle_file_list,
-            '-y'        : self._handle_library,
-            '+incdir+'  : self._handle_include,
-            '+define+'  : self._handle_define,
-            '+libext+'  : self._handle_libext,
-            '+liborder+': self._handle_liborder,
+        # Dash options taking a separate value, and +option+ handlers; each
+        # argument is routed with a single dict lookup
+        self._dash_options = {
+            '-D': self._handle_define,
+            '-I': self._handle_include,
+            '-f': self._handle_file_list,
+            '-y': self._handle_library,
         }
-    
+        self._plus_options = {
+            'define': self._handle_define,
+            'incdir': self._handle_include,
+            'libext': self._handle_libext,
+            'liborder': self._handle_liborder,
+        }
+
     def parameter(self, args: List[str]) -> List[str]:
         """Process command line parameters and return remaining args"""
         processed_args = []
-        i = 0
-        
-        while i < len(args):
-            arg = args[i]
-            
-            # Handle known option patterns
-            handled = False
-            for pattern, handler in self.option_patterns.items():
-                if arg.startswith(pattern):
-                    if pattern in ['-D', '-I', '-f', '-y']:
-                        # These take a value
-                        if i + 1 < len(args):
-                            handler(arg, args[i + 1])
-                            i += 2
-                        else:
-                            raise ValueError(f"Option {arg} requires a value")
-                    else:
-                        # These have the value in the same argument
-                        handler(arg)
-                        i += 1
-                    handled = True
-                    break
-            
-            if not handled:
-                # Check for +define+ and +incdir+ patterns
-                if arg.startswith('+define+'):
-                    self._handle_define(arg)
-                    i += 1
-                elif arg.startswith('+incdir+'):
-                    self._handle_include(arg)
-                    i += 1
-                elif arg.startswith('+libext+'):
-                    self._handle_libext(arg)
-                    i += 1
-                elif arg.startswith('+liborder+'):
-                    self._handle_liborder(arg)
-                    i += 1
-                elif arg.startswith('-'):
-                    # Unknown option, pass through
-                    processed_args.append(arg)
-                    i += 1
+        dash_options = self._dash_options
+        plus_options = self._plus_options
+        args_iter = iter(args)
+
+        for arg in args_iter:
+            # -D/-I/-f/-y take the following argument as their value
+            handler = dash_options.get(arg)
+            if handler is not None:
+                value = next(args_iter, None)
+                if value is None:
+                    raise ValueError(f"Option {arg} requires a value")
+                handler(arg, value)
+                continue
+
+            # +define+/+incdir+/+libext+/+liborder+ carry the value inline
+            if arg.startswith('+'):
+                handler = plus_options.get(arg.split('+', 2)[1])
+                if handler is not None:
+                    handler(arg)
+                    continue
+
+            if arg.startswith('-'):
+                # Unknown option, pass through
+                processed_args.append(arg)
+            else:
+                # File argument
+                if self.filename_expansion:
+                    expanded_files = self._expand_filename(arg)
+                    self.files.extend(expanded_files)
+                    self.depend_files.extend(expanded_files)
                 else:
-                    # File argument
-                    if self.filename_expansion:
-                        expanded_files = self._expand_filename(arg)
-                        self.files.extend(expanded_files)
-                        self.depend_files.extend(expanded_files)
-                    else:
-                        self.files.append(arg)
-                        self.depend_files.append(arg)
-                    i += 1
-        
+                    self.files.append(arg)
+                    self.depend_files.append(arg)
+
         return processed_args
     
     def _handle_define(self, option: str, value: Optional[str] = None) -> None:
@@ -122,24 +118,45 @@ class Getopt:
     
     def _handle_file_list(self, option: str, filename: str) -> None:
         """Handle -f file list option"""
-        try:
-            with open(filename, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # Expand any options in the file
-                        if line.startswith('-'):
-                            # This is an option, not a file
-                            continue
-                        if self.filename_expansion:
-                            expanded_files = self._expand_filename(line)
-                            self.files.extend(expanded_files)
-                            self.depend_files.extend(expanded_files)
-                        else:
-                            self.files.append(line)
-                            self.depend_files.append(line)
-        except FileNotFoundError:
-            raise ValueError(f"File list not found: {filename}")
+        # Map each list into memory and split it once in C rather than
+        # iterating/stripping line by line; nested -f lists are queued
+        pending = [filename]
+        while pending:
+            path = pending.pop()
+            try:
+                with open(path, 'rb') as f:
+                    try:
+                        with mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ) as mapped:
+                            data = bytes(mapped)
+                    except ValueError:
+                        # Empty files cannot be mapped
+                        data = f.read()
+            except (FileNotFoundError, OSError):
+                raise ValueError(f"File list not found: {path}")
+
+            for raw_line in data.split(b'\n'):
+                raw_line = raw_line.strip()
+                if (not raw_line or raw_line.startswith(b'#')
+                        or raw_line.startswith(b'//')):
+                    continue
+                line = os.fsdecode(raw_line)
+                if line.startswith('-f'):
+                    # Nested file list
+                    nested = line[2:].strip()
+                    if nested:
+                        pending.append(nested)
+                    continue
+                if line.startswith('-'):
+                    # This is an option, not a file
+                    continue
+                if self.filename_expansion:
+                    expanded_files = self._expand_filename(line)
+                    self.files.extend(expanded_files)
+                    self.depend_files.extend(expanded_files)
+                else:
+                    self.files.append(line)
+                    self.depend_files.append(line)
     
     def _handle_library(self, option: str, library_path: str) -> None:
         """Handle -y library option"""
@@ -159,21 +176,37 @@ class Getopt:
     def _expand_filename(self, filename: str) -> List[str]:
         """Expand filename patterns (globbing)"""
         try:
-            # Use pathlib for cross-platform globbing
-            path = Path(filename)
             if '*' in filename or '?' in filename:
-                # This is a pattern, expand it
-                parent = path.parent
-                pattern = path.name
-                if parent.exists():
-                    return [str(p) for p in parent.glob(pattern)]
-                else:
+                dir_part, base_pattern = os.path.split(filename)
+                if '*' in dir_part or '?' in dir_part:
+                    # Wildcarded directory parts still go through pathlib
+                    path = Path(filename)
+                    if path.parent.exists():
+                        return [str(p) for p in path.parent.glob(path.name)]
                     return []
+                # Scan the directory once (cached) and filter the names;
+                # DirEntry carries the file type without an extra stat
+                names = self._list_dir(dir_part)
+                return [os.path.join(dir_part, name)
+                        for name in fnmatch.filter(names, base_pattern)]
             else:
-                # Single file
-                return [filename] if Path(filename).exists() else []
+                # Single file; the same paths recur across -f lists, so
+                # the existence check is cached
+                return [filename] if _stat_exists(filename) else []
         except Exception:
             return [filename]
+
+    def _list_dir(self, dir_part: str) -> List[str]:
+        """Return a directory's file names, cached per directory"""
+        names = self._dir_cache.get(dir_part)
+        if names is None:
+            try:
+                with os.scandir(dir_part or '.') as entries:
+                    names = [entry.name for entry in entries if entry.is_file()]
+            except OSError:
+                names = []
+            self._dir_cache[dir_part] = names
+        return names
     
     def defvalue(self, symbol: str) -> Optional[str]:
         """Get the value of a define, with warning if not found"""
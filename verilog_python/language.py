@@ -6,8 +6,135 @@ such as parsing numbers or determining what keywords exist.
 """
 
 import re
+import sys
+from functools import lru_cache
 from typing import Dict, List, Optional, Union, Tuple
 
+from ._jit import njit
+
+
+@njit()
+def _scan_sized_number(buf: bytes):
+    """Scan a sized literal b"<size>'[s]<base><digits>" starting at offset 0.
+
+    Returns (ok, size, value, signed, has_xz).  Digits are accumulated with a
+    manual loop so the function can be JIT-compiled; x/z digits count as zero
+    and underscores are skipped, matching the Verilog value rules.
+    """
+    n = len(buf)
+    i = 0
+    size = 0
+    ndigits = 0
+    while i < n and 48 <= buf[i] <= 57:  # '0'-'9'
+        size = size * 10 + (buf[i] - 48)
+        i += 1
+        ndigits += 1
+    if ndigits == 0 or i >= n or buf[i] != 39:  # "'"
+        return (False, 0, 0, False, False)
+    i += 1
+    signed = False
+    if i < n and buf[i] == 115:  # 's'
+        signed = True
+        i += 1
+    if i >= n:
+        return (False, 0, 0, False, False)
+    base_char = buf[i]
+    if base_char == 98:  # 'b'
+        base = 2
+    elif base_char == 100:  # 'd'
+        base = 10
+    elif base_char == 104:  # 'h'
+        base = 16
+    else:
+        return (False, 0, 0, False, False)
+    i += 1
+    value = 0
+    ndigits = 0
+    has_xz = False
+    while i < n:
+        c = buf[i]
+        if c == 95:  # '_'
+            i += 1
+            continue
+        is_xz = c == 120 or c == 88 or c == 122 or c == 90  # x/X/z/Z
+        if is_xz:
+            digit = 0
+            has_xz = True
+        elif 48 <= c <= 57:  # '0'-'9'
+            digit = c - 48
+        elif 97 <= c <= 102:  # 'a'-'f'
+            digit = c - 87
+        elif 65 <= c <= 70:  # 'A'-'F'
+            digit = c - 55
+        else:
+            break
+        if not is_xz and digit >= base:
+            return (False, 0, 0, False, False)
+        value = value * base + digit
+        i += 1
+        ndigits += 1
+    if ndigits == 0:
+        return (False, 0, 0, False, False)
+    return (True, size, value, signed, has_xz)
+
+
+# The undecorated scanner: numba exposes it as py_func, the no-op shim
+# returns the function itself. Wide literals route here because the
+# jitted build accumulates in int64 and would silently wrap.
+_scan_sized_number_py = getattr(_scan_sized_number, 'py_func',
+                                _scan_sized_number)
+
+# Most digits a value of each base can have and still fit in int64
+_INT64_SAFE_DIGITS = {98: 62, 100: 18, 104: 15}  # b / d / h
+
+
+# Matches the NAME[msb:lsb] shape handled by split_bus
+_SPLIT_BUS_RE = re.compile(r'(\w+)\[(\d+):(\d+)\]')
+
+
+@lru_cache(maxsize=4096)
+def _parse_literal(number_string: str):
+    """Parse a sized literal once, caching (ok, size, value, signed, has_xz).
+
+    Literals like 1'b0 and 32'h0 recur constantly in real designs, so
+    repeated parses become a single dict hit.
+    """
+    try:
+        buf = number_string.encode('ascii')
+    except UnicodeEncodeError:
+        return (False, 0, 0, False, False)
+    # Literals too wide for the jitted scanner's int64 accumulator take
+    # the exact arbitrary-precision Python path
+    apos = buf.find(39)  # "'"
+    if apos >= 0:
+        base_pos = apos + 1
+        if base_pos < len(buf) and buf[base_pos] == 115:  # 's'
+            base_pos += 1
+        if base_pos < len(buf):
+            safe = _INT64_SAFE_DIGITS.get(buf[base_pos])
+            ndigits = len(buf) - base_pos - 1 - buf.count(b'_', base_pos)
+            if safe is not None and ndigits > safe:
+                return _scan_sized_number_py(buf)
+    return _scan_sized_number(buf)
+
+
+# Compiler directives and gate primitives, frozen at module scope so hot
+# callers can test membership directly without a classmethod call
+COMPDIRECTS = frozenset({
+    '`begin_keywords', '`celldefine', '`default_nettype', '`define',
+    '`else', '`elsif', '`end_keywords', '`endcelldefine', '`endif',
+    '`ifdef', '`ifndef', '`include', '`line', '`nounconnected_drive',
+    '`pragma', '`resetall', '`timescale', '`unconnected_drive',
+    '`undef', '`undefineall'
+})
+
+GATEPRIMS = frozenset({
+    'and', 'nand', 'or', 'nor', 'xor', 'xnor', 'buf', 'not',
+    'bufif0', 'bufif1', 'notif0', 'notif1', 'pullup', 'pulldown',
+    'cmos', 'rcmos', 'nmos', 'pmos', 'rnmos', 'rpmos', 'tran',
+    'rtran', 'tranif0', 'tranif1', 'rtranif0', 'rtranif1'
+})
+
 
 class Language:
     """Verilog language utilities class"""
@@ -71,69 +198,42 @@ class Language:
         }
     }
     
-    # Compiler directives
-    COMPDIRECTS = {
-        '`begin_keywords', '`celldefine', '`default_nettype', '`define',
-        '`else', '`elsif', '`end_keywords', '`endcelldefine', '`endif',
-        '`ifdef', '`ifndef', '`include', '`line', '`nounconnected_drive',
-        '`pragma', '`resetall', '`timescale', '`unconnected_drive',
-        '`undef', '`undefineall'
-    }
-    
-    # Gate primitives
-    GATEPRIMS = {
-        'and', 'nand', 'or', 'nor', 'xor', 'xnor', 'buf', 'not',
-        'bufif0', 'bufif1', 'notif0', 'notif1', 'pullup', 'pulldown',
-        'cmos', 'rcmos', 'nmos', 'pmos', 'rnmos', 'rpmos', 'tran',
-        'rtran', 'tranif0', 'tranif1', 'rtranif0', 'rtranif1'
-    }
+    # Compiler directives; shared with the module-level frozenset so hot
+    # callers can test membership without going through the classmethod
+    COMPDIRECTS = COMPDIRECTS
+
+    # Gate primitives, likewise aliasing the module-level frozenset
+    GATEPRIMS = GATEPRIMS
     
     def __init__(self, standard: Optional[str] = None):
         """Initialize Language with optional standard specification"""
         self.standard = standard
         self._all_keywords = self._build_keyword_set()
-    
-    def _build_keyword_set(self) -> set:
-        """Build complete keyword set based on standard"""
-        keywords = set()
-        if self.standard:
-            # Add keywords up to specified standard
-            for std in self.STANDARDS:
-                if std in self.KEYWORDS:
-                    keywords.update(self.KEYWORDS[std])
-                if std == self.standard:
-                    break
-        else:
-            # Add all keywords
-            for std_keywords in self.KEYWORDS.values():
-                keywords.update(std_keywords)
-        return keywords
-    
+
+    def _build_keyword_set(self) -> frozenset:
+        """Return the complete keyword set based on standard"""
+        if self.standard and self.standard in _KEYWORDS_BY_STD:
+            return _KEYWORDS_BY_STD[self.standard]
+        return _ALL_KEYWORDS
+
     @classmethod
     def is_keyword(cls, symbol: str, standard: Optional[str] = None) -> bool:
         """Return true if the given symbol string is a Verilog reserved keyword"""
-    
-        
         if standard:
             if standard not in cls.KEYWORDS:
                 return False
-            else :
-                lang = cls(standard)
-        else:
-            lang = cls()
-        return symbol in lang._all_keywords
-        
+            return symbol in _KEYWORDS_BY_STD[standard]
+        return symbol in _ALL_KEYWORDS
 
-    
     @classmethod
     def is_compdirect(cls, symbol: str) -> bool:
         """Return true if the given symbol string is a Verilog compiler directive"""
-        return symbol in cls.COMPDIRECTS
-    
+        return symbol in COMPDIRECTS
+
     @classmethod
     def is_gateprim(cls, symbol: str) -> bool:
         """Return true if the given symbol is a built in gate primitive"""
-        return symbol in cls.GATEPRIMS
+        return symbol in GATEPRIMS
     
     @classmethod
     def language_standard(cls, standard: str) -> None:
@@ -150,103 +250,49 @@ class Language:
     @classmethod
     def number_value(cls, number_string: str) -> Optional[int]:
         """Return the numeric value of a Verilog value, or None if incorrectly formed"""
-        try:
-            # Handle signed numbers: 1'sh1, 32'sh1b, etc.
-            signed_match = re.match(r'(\d+)\'s([bdh])([0-9a-fA-F_xXzZ]+)', number_string)
-            if signed_match:
-                size, base, value = signed_match.groups()
-                # Convert to integer based on base
-                if base == 'b':
-                    # Binary
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 2)
-                elif base == 'd':
-                    # Decimal
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 10)
-                elif base == 'h':
-                    # Hexadecimal
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 16)
-            
-            # Handle unsigned numbers: 32'h1b, 4'b111, etc.
-            unsigned_match = re.match(r'(\d+)\'([bdh])([0-9a-fA-F_xXzZ]+)', number_string)
-            if unsigned_match:
-                size, base, value = unsigned_match.groups()
-                # Convert to integer based on base
-                if base == 'b':
-                    # Binary
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 2)
-                elif base == 'd':
-                    # Decimal
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 10)
-                elif base == 'h':
-                    # Hexadecimal
-                    value = value.replace('_', '').replace('x', '0').replace('z', '0')
-                    return int(value, 16)
-            
-            # Handle simple decimal numbers
-            if re.match(r'^\d+$', number_string):
-                return int(number_string)
-            
-            return None
-        except (ValueError, AttributeError):
+        if not isinstance(number_string, str):
             return None
+
+        # Handle sized numbers: 32'h1b, 4'b111, 1'sh1, etc.
+        ok, _size, value, _signed, _has_xz = _parse_literal(number_string)
+        if ok:
+            return value
+
+        # Handle simple decimal numbers
+        if number_string.isdigit():
+            return int(number_string)
+
+        return None
     
     @classmethod
-    def unsigned_to_signed(cls, x:int, n:int) -> int:
-        if (x >> (n - 1)) == 1:
-            signed_x = (1 << n) - x
-            return -signed_x
-        else:
-            return x
+    def unsigned_to_signed(cls, x: int, n: int) -> int:
+        """Sign-extend an n-bit unsigned value to a signed int, branchlessly"""
+        sign_bit = 1 << (n - 1)
+        return ((x & ((1 << n) - 1)) ^ sign_bit) - sign_bit
     
     @classmethod
     def number_bits(cls, number_string: str) -> Optional[int]:
         """Return the number of bits in a value string, or None if incorrectly formed"""
-        # Handle signed numbers: 1'sh1, 32'sh1b, etc.
-        signed_match = re.match(r'(\d+)\'(s\w)([a-f0-9A-F_]+)', number_string)
-        
-        if signed_match:
-            print(signed_match.groups())
-            if signed_match.group(2) == 'sb':
-                # Binary
-                value = signed_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return cls.unsigned_to_signed(int(value, 2), int(signed_match.group(1)))
-            elif signed_match.group(2) == 'sd':
-                # Decimal
-                value = signed_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return cls.unsigned_to_signed(int(value, 10), int(signed_match.group(1)))
-            elif signed_match.group(2) == 'sh':
-                # Hexadecimal
-                value = signed_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return cls.unsigned_to_signed(int(value, 16), int(signed_match.group(1)))
-        
-        # Handle unsigned numbers: 32'h1b, 4'b111, etc.
-        unsigned_match = re.match(r'(\d+)\'(\w)([a-f0-9A-F_]+)', number_string)
-        if unsigned_match:
-            # print(unsigned_match.group(2))
-            if unsigned_match.group(2) == 'b':
-                # Binary
-                value = unsigned_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return int(value, 2)
-            elif unsigned_match.group(2) == 'd':
-                # Decimal
-                value = unsigned_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return int(value, 10)
-            elif unsigned_match.group(2) == 'h':
-                # Hexadecimal
-                value = unsigned_match.group(3).replace('_', '').replace('x', '0').replace('z', '0')
-                return int(value, 16)
-        return None
+        if not isinstance(number_string, str):
+            return None
+
+        # Handle sized numbers: 32'h1b, 4'b111, 1'sh1, etc.; unlike
+        # number_value, x/z digits are rejected here.
+        ok, size, value, signed, has_xz = _parse_literal(number_string)
+        if not ok or has_xz:
+            return None
+        if signed:
+            return cls.unsigned_to_signed(value, size)
+        return value
     
     @classmethod
     def number_signed(cls, number_string: str) -> Optional[bool]:
         """Return true if the Verilog value is signed, else None"""
+        if not isinstance(number_string, str):
+            return None
         # Check for signed notation: 1'sh1, 32'sh1b, etc.
-        if re.match(r'\d+\'s[bdh]', number_string):
+        ok, _size, _value, signed, _has_xz = _parse_literal(number_string)
+        if ok and signed:
             return True
         return None
     
@@ -255,29 +301,62 @@ class Language:
         """Return a list of expanded arrays"""
         # Simple implementation for basic bus expansion
         # This is a simplified version - full implementation would be more complex
-        match = re.match(r'(\w+)\[(\d+):(\d+)\]', bus)
-        if match:
-            name, high, low = match.groups()
-            high, low = int(high), int(low)
-            result = []
-            for i in range(high, low - 1, -1):
-                result.append(f"{name}[{i}]")
-            return result
-        return [bus]
-    
+        return cls.split_bus_nocomma(bus)
+
     @classmethod
     def split_bus_nocomma(cls, bus: str) -> List[str]:
         """As with split_bus, but faster for simple decimal colon separated arrays"""
-        return cls.split_bus(bus)
+        match = _SPLIT_BUS_RE.match(bus)
+        if not match:
+            return [bus]
+        name, msb, lsb = match.groups()
+        msb, lsb = int(msb), int(lsb)
+        step = -1 if msb >= lsb else 1
+        # map pushes the formatting loop into C
+        index_format = (name + '[{}]').format
+        return list(map(index_format, range(msb, lsb + step, step)))
     
     @classmethod
     def strip_comments(cls, text: str) -> str:
         """Return text with any // or /**/ comments stripped"""
-        # Remove // comments
-        text = re.sub(r'//.*$', '', text, flags=re.MULTILINE)
-        # Remove /* */ comments
-        text = re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
-        return text 
+        # Single pass over the text, jumping between candidate '/' positions
+        # with str.find so the bulk scanning happens at C speed instead of
+        # per-character Python branches.
+        start = text.find('/')
+        if start == -1:
+            return text
+        parts = []
+        pos = 0
+        n = len(text)
+        while start != -1 and start < n - 1:
+            next_char = text[start + 1]
+            if next_char == '/':
+                # Single line comment; keep the trailing newline
+                parts.append(text[pos:start])
+                end = text.find('\n', start + 2)
+                pos = n if end == -1 else end
+            elif next_char == '*':
+                # Multi-line comment; an unterminated one is kept as-is
+                end = text.find('*/', start + 2)
+                if end == -1:
+                    break
+                parts.append(text[pos:start])
+                pos = end + 2
+            start = text.find('/', max(pos, start + 1))
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+
+# Cumulative keyword tables, built once at import.  Each standard maps to a
+# frozenset of interned keyword strings covering that standard and all its
+# predecessors, so membership checks are a single hash lookup.
+_KEYWORDS_BY_STD: Dict[str, frozenset] = {}
+_cumulative = set()
+for _std in Language.STANDARDS:
+    _cumulative.update(Language.KEYWORDS.get(_std, ()))
+    _KEYWORDS_BY_STD[_std] = frozenset(sys.intern(_kw) for _kw in _cumulative)
+_ALL_KEYWORDS = frozenset(sys.intern(_kw) for _kw in _cumulative)
+del _cumulative
 
 
 
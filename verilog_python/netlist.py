@@ -1,369 +1,687 @@
-"""
-Verilog::Netlist - Design hierarchy and netlist management
-
-This module reads and holds interconnect information about a whole
-design database, providing hierarchy and signal connectivity information.
-"""
-
-from typing import Dict, List, Optional, Any, Set
-from .language import Language
-from .preproc import Preproc
-from .parser import SigParser
-
-
-class Net:
-    """Represents a net (signal) in the design"""
-    
-    def __init__(self, name: str, net_type: str = 'wire', width: int = 1):
-        self.name = name
-        self.net_type = net_type
-        self.width = width
-        self.connections = []  # List of connected pins
-        self.driver = None  # Driving pin
-        self.loads = []  # Load pins
-    
-    def add_connection(self, pin):
-        """Add a connection to this net"""
-        self.connections.append(pin)
-    
-    def set_driver(self, pin):
-        """Set the driving pin for this net"""
-        self.driver = pin
-    
-    def add_load(self, pin):
-        """Add a load pin to this net"""
-        self.loads.append(pin)
-    
-    def __repr__(self):
-        return f"Net({self.name}, {self.net_type}, width={self.width})"
-
-
-class Port:
-    """Represents a port in a module"""
-    
-    def __init__(self, name: str, direction: str, width: int = 1):
-        self.name = name
-        self.direction = direction  # 'input', 'output', 'inout'
-        self.width = width
-        self.net = None  # Connected net
-    
-    def connect_net(self, net: Net):
-        """Connect this port to a net"""
-        self.net = net
-    
-    def __repr__(self):
-        return f"Port({self.name}, {self.direction}, width={self.width})"
-
-
-class Pin:
-    """Represents a pin connection on a cell"""
-    
-    def __init__(self, name: str, net: Optional[Net] = None):
-        self.name = name
-        self.net = net
-        self.cell = None  # Parent cell
-    
-    def connect_net(self, net: Net):
-        """Connect this pin to a net"""
-        self.net = net
-    
-    def __repr__(self):
-        return f"Pin({self.name}, net={self.net.name if self.net else None})"
-
-
-class Cell:
-    """Represents a cell (module instantiation) in the design"""
-    
-    def __init__(self, name: str, module_name: str):
-        self.name = name
-        self.module_name = module_name
-        self.pins = {}  # Dictionary of pin name -> Pin object
-        self.module = None  # Reference to the actual module
-        self.parent_module = None  # Parent module containing this cell
-    
-    def add_pin(self, pin_name: str, net: Optional[Net] = None) -> Pin:
-        """Add a pin to this cell"""
-        pin = Pin(pin_name, net)
-        pin.cell = self
-        self.pins[pin_name] = pin
-        return pin
-    
-    def get_pin(self, pin_name: str) -> Optional[Pin]:
-        """Get a pin by name"""
-        return self.pins.get(pin_name)
-    
-    def __repr__(self):
-        return f"Cell({self.name}, module={self.module_name})"
-
-
-class Module:
-    """Represents a module in the design"""
-    
-    def __init__(self, name: str, keyword: str = 'module'):
-        self.name = name
-        self.keyword = keyword
-        self.ports = {}  # Dictionary of port name -> Port object
-        self.nets = {}  # Dictionary of net name -> Net object
-        self.cells = {}  # Dictionary of cell name -> Cell object
-        self.parameters = {}  # Dictionary of parameter name -> value
-        self.parent_netlist = None  # Reference to parent netlist
-        self.is_top = False
-        self.filename = None
-        self.line = 0
-    
-    def add_port(self, name: str, direction: str, width: int = 1) -> Port:
-        """Add a port to this module"""
-        port = Port(name, direction, width)
-        self.ports[name] = port
-        return port
-    
-    def add_net(self, name: str, net_type: str = 'wire', width: int = 1) -> Net:
-        """Add a net to this module"""
-        net = Net(name, net_type, width)
-        self.nets[name] = net
-        return net
-    
-    def add_cell(self, name: str, module_name: str) -> Cell:
-        """Add a cell to this module"""
-        cell = Cell(name, module_name)
-        cell.parent_module = self
-        self.cells[name] = cell
-        return cell
-    
-    def add_parameter(self, name: str, value: str):
-        """Add a parameter to this module"""
-        self.parameters[name] = value
-    
-    def get_port(self, name: str) -> Optional[Port]:
-        """Get a port by name"""
-        return self.ports.get(name)
-    
-    def get_net(self, name: str) -> Optional[Net]:
-        """Get a net by name"""
-        return self.nets.get(name)
-    
-    def get_cell(self, name: str) -> Optional[Cell]:
-        """Get a cell by name"""
-        return self.cells.get(name)
-    
-    def __repr__(self):
-        return f"Module({self.name}, ports={len(self.ports)}, nets={len(self.nets)}, cells={len(self.cells)})"
-
-    def link(self):
-        """Link a module's cells to their actual modules"""
-        for cell_name, cell in self.cells.items():
-            if cell.module_name in self.parent_netlist.modules:
-                cell.module = self.parent_netlist.modules[cell.module_name]
-            else:
-                print(f"Warning: Module {cell.module_name} not found for cell {cell_name}")
-
-
-class Netlist:
-    """Main netlist class that manages the entire design hierarchy"""
-    
-    def __init__(self, options: Optional[Any] = None):
-        """Initialize netlist with options"""
-        self.modules = {}  # Dictionary of module name -> Module object
-        self.files = {}  # Dictionary of filename -> file info
-        self.options = options
-        self.preproc = Preproc()
-        self.parser = SigParser()
-        self.language = Language()
-        
-        # Configuration options
-        self.implicit_wires_ok = True
-        self.link_read = True
-        self.use_vars = True
-        self.keep_comments = False
-        self.synthesis = False
-        
-        # Internal state
-        self._need_link = []
-        self._relink = False
-    
-    def read_file(self, filename: str) -> None:
-        """Read a Verilog file and add its modules to the netlist"""
-        try:
-            # Preprocess the file
-            preprocessed_content = self.preproc.preprocess_file(filename)
-            
-            # Parse the preprocessed content
-            self._parse_file_content(preprocessed_content, filename)
-            
-            # Track the file
-            self.files[filename] = {
-                'modules': [],
-                'content': preprocessed_content
-            }
-            
-        except FileNotFoundError:
-            print(f"Warning: File not found: {filename}")
-        except Exception as e:
-            print(f"Error reading file {filename}: {e}")
-    
-    def _parse_file_content(self, content: str, filename: str) -> None:
-        """Parse the content of a file and extract modules"""
-        # Set up callbacks for the parser
-        callbacks = {
-            'module_begin': self._on_module_begin,
-            'module_end': self._on_module_end,
-            'signal_declaration': self._on_signal_declaration,
-            'parameter_declaration': self._on_parameter_declaration,
-        }
-        
-        self.parser.callbacks = callbacks
-        self.parser.parse(content)
-        
-        # Get module info from the parser
-        module_info = self.parser.get_module_info()
-        if module_info['name']:
-            self._create_module_from_info(module_info, filename)
-    
-    def _on_module_begin(self, name: str, line: int) -> None:
-        """Callback when a module begins"""
-        # This will be handled in _create_module_from_info
-        pass
-    
-    def _on_module_end(self) -> None:
-        """Callback when a module ends"""
-        pass
-    
-    def _on_signal_declaration(self, signal_type: str, name: str, 
-                              type_info: str, line: int) -> None:
-        """Callback when a signal is declared"""
-        # This will be handled in _create_module_from_info
-        pass
-    
-    def _on_parameter_declaration(self, name: str, line: int) -> None:
-        """Callback when a parameter is declared"""
-        # This will be handled in _create_module_from_info
-        pass
-    
-    def _create_module_from_info(self, module_info: Dict[str, Any], filename: str) -> None:
-        """Create a module from parser information"""
-        module_name = module_info['name']
-        module = Module(module_name)
-        module.filename = filename
-        
-        # Add ports
-        for port_info in module_info['ports']:
-            port = module.add_port(
-                port_info['name'],
-                port_info['direction'],
-                width=1  # Default width, could be parsed from the declaration
-            )
-        
-        # Add nets
-        for net_info in module_info['nets']:
-            net = module.add_net(
-                net_info['name'],
-                net_info['type'],
-                width=1  # Default width, could be parsed from the declaration
-            )
-        
-        # Add parameters
-        for param_info in module_info['parameters']:
-            module.add_parameter(param_info['name'], '1')  # Default value
-        
-        # Add to netlist
-        self.modules[module_name] = module
-        module.parent_netlist = self
-        
-        # Track for linking
-        self._need_link.append(module)
-    
-    def link(self) -> None:
-        """Link all modules in the netlist"""
-        # Link modules that need linking
-        while self._need_link:
-            module = self._need_link.pop()
-            module.link()
-        
-        # Relink if needed
-        self._relink = True
-        while self._relink:
-            self._relink = False
-            for module in self.modules.values():
-                module.link()
-    
-    def find_module(self, name: str) -> Optional[Module]:
-        """Find a module by name"""
-        return self.modules.get(name)
-    
-    def get_modules(self) -> List[Module]:
-        """Get all modules in the netlist"""
-        return list(self.modules.values())
-    
-    def get_top_modules(self) -> List[Module]:
-        """Get top-level modules (those not instantiated by other modules)"""
-        top_modules = []
-        instantiated_modules = set()
-        
-        # Find all instantiated modules
-        for module in self.modules.values():
-            for cell in module.cells.values():
-                if cell.module:
-                    instantiated_modules.add(cell.module.name)
-        
-        # Return modules that are not instantiated
-        for module in self.modules.values():
-            if module.name not in instantiated_modules:
-                top_modules.append(module)
-        
-        return top_modules
-    
-    def dump(self) -> None:
-        """Dump the netlist structure for debugging"""
-        print("Netlist Dump:")
-        print("=============")
-        
-        for module_name, module in self.modules.items():
-            print(f"\nModule: {module_name}")
-            print(f"  Ports: {len(module.ports)}")
-            for port_name, port in module.ports.items():
-                print(f"    {port.direction} {port_name}")
-            
-            print(f"  Nets: {len(module.nets)}")
-            for net_name, net in module.nets.items():
-                print(f"    {net.net_type} {net_name}")
-            
-            print(f"  Cells: {len(module.cells)}")
-            for cell_name, cell in module.cells.items():
-                print(f"    {cell_name} ({cell.module_name})")
-    
-    def verilog_text(self) -> str:
-        """Generate Verilog text representation of the netlist"""
-        lines = []
-        
-        for module in self.modules.values():
-            lines.append(f"module {module.name} (")
-            
-            # Port declarations
-            port_names = list(module.ports.keys())
-            if port_names:
-                lines.append("  " + ", ".join(port_names))
-            lines.append(");")
-            
-            # Port directions
-            for port_name, port in module.ports.items():
-                lines.append(f"  {port.direction} {port_name};")
-            
-            # Net declarations
-            for net_name, net in module.nets.items():
-                if net_name not in module.ports:
-                    lines.append(f"  {net.net_type} {net_name};")
-            
-            # Cell instantiations
-            for cell_name, cell in module.cells.items():
-                lines.append(f"  {cell.module_name} {cell_name} (")
-                pin_connections = []
-                for pin_name, pin in cell.pins.items():
-                    if pin.net:
-                        pin_connections.append(f"    .{pin_name}({pin.net.name})")
-                lines.append(",\n".join(pin_connections))
-                lines.append("  );")
-            
-            lines.append("endmodule")
-            lines.append("")
-        
-        return "\n".join(lines) 
\ No newline at end of file
+"""
+Verilog::Netlist - Design hierarchy and netlist management
+
+This module reads and holds interconnect information about a whole
+design database, providing hierarchy and signal connectivity information.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Set, Tuple
+from .language import Language
+from .preproc import Preproc
+from .parser import SigParser
+
+log = logging.getLogger(__name__)
+
+
+# Bumped whenever the cached payload layout changes, so stale-format
+# entries miss instead of loading wrong
+_PARSE_CACHE_FORMAT = 3
+
+
+def _parse_cache_key(filename: str, defines: Dict[str, str]) -> str:
+    """Build a cache key covering the file identity and active defines"""
+    stat = os.stat(filename)
+    blob = (f"{_PARSE_CACHE_FORMAT}|{os.path.abspath(filename)}|"
+            f"{stat.st_mtime_ns}|{stat.st_size}|{sorted(defines.items())}")
+    return hashlib.blake2b(blob.encode(), digest_size=20).hexdigest()
+
+
+def _collect_module_infos(parser: 'SigParser',
+                          content: str) -> List[Dict[str, Any]]:
+    """Parse content, collecting one info dict per module"""
+    infos = []
+    parser.callbacks = {
+        'module_end': lambda: infos.append(parser.get_module_info()),
+    }
+    parser.parse(content)
+    # A missing endmodule still reports what was collected
+    last = parser.get_module_info()
+    if last['name'] and (not infos or infos[-1]['name'] != last['name']):
+        infos.append(last)
+    return infos
+
+
+def _parse_one_file(job):
+    """Worker: preprocess and parse one file, returning picklable results
+
+    Collects one info dict per module so files declaring several
+    modules survive the round trip through the pool.
+    """
+    filename, defines, include_paths = job
+    try:
+        preproc = Preproc(defines=dict(defines),
+                          include_paths=list(include_paths))
+        content = preproc.preprocess_file(filename)
+        infos = _collect_module_infos(SigParser(), content)
+        return filename, content, infos, preproc.included_files, None
+    except Exception as e:
+        return filename, None, None, None, str(e)
+
+
+class Net:
+    """Represents a net (signal) in the design"""
+
+    __slots__ = ('name', 'net_type', 'width', 'connections', '_driver_index')
+
+    def __init__(self, name: str, net_type: str = 'wire', width: int = 1):
+        # Names repeat across modules and net types come from a tiny
+        # vocabulary; interning shares the string objects and lets dict
+        # probes short-circuit on identity
+        self.name = sys.intern(name)
+        self.net_type = sys.intern(net_type)
+        self.width = width
+        # Single pin list; the driver is marked by index and the loads
+        # are every other connection, so there is one collection to
+        # keep consistent instead of three
+        self.connections = []
+        self._driver_index = -1
+
+    @property
+    def driver(self):
+        """The driving pin for this net, or None"""
+        if self._driver_index < 0:
+            return None
+        return self.connections[self._driver_index]
+
+    @property
+    def loads(self):
+        """Every connected pin other than the driver"""
+        driver_index = self._driver_index
+        return [pin for index, pin in enumerate(self.connections)
+                if index != driver_index]
+
+    def add_connection(self, pin):
+        """Add a connection to this net"""
+        self.connections.append(pin)
+
+    def set_driver(self, pin):
+        """Set the driving pin for this net"""
+        try:
+            self._driver_index = self.connections.index(pin)
+        except ValueError:
+            self.connections.append(pin)
+            self._driver_index = len(self.connections) - 1
+
+    def add_load(self, pin):
+        """Add a load pin to this net"""
+        self.connections.append(pin)
+    
+    def __repr__(self):
+        return f"Net({self.name}, {self.net_type}, width={self.width})"
+
+
+class Port:
+    """Represents a port in a module"""
+
+    __slots__ = ('name', 'direction', 'width', 'net')
+
+    def __init__(self, name: str, direction: str, width: int = 1):
+        self.name = sys.intern(name)
+        self.direction = sys.intern(direction)  # 'input', 'output', 'inout'
+        self.width = width
+        self.net = None  # Connected net
+    
+    def connect_net(self, net: Net):
+        """Connect this port to a net"""
+        self.net = net
+    
+    def __repr__(self):
+        return f"Port({self.name}, {self.direction}, width={self.width})"
+
+
+class Pin:
+    """Represents a pin connection on a cell"""
+
+    __slots__ = ('name', 'net', 'cell')
+
+    def __init__(self, name: str, net: Optional[Net] = None):
+        self.name = sys.intern(name)
+        self.net = net
+        self.cell = None  # Parent cell
+    
+    def connect_net(self, net: Net):
+        """Connect this pin to a net"""
+        self.net = net
+        # The connection shows up in the parent module's rendered text,
+        # so invalidate its cached rendering
+        cell = self.cell
+        if cell is not None and cell.parent_module is not None:
+            cell.parent_module._dirty = True
+
+    def __repr__(self):
+        return f"Pin({self.name}, net={self.net.name if self.net else None})"
+
+
+class Cell:
+    """Represents a cell (module instantiation) in the design"""
+
+    __slots__ = ('name', 'module_name', 'pins', 'module', 'parent_module')
+
+    def __init__(self, name: str, module_name: str):
+        self.name = sys.intern(name)
+        self.module_name = sys.intern(module_name)
+        self.pins = {}  # Dictionary of pin name -> Pin object
+        self.module = None  # Reference to the actual module
+        self.parent_module = None  # Parent module containing this cell
+    
+    def add_pin(self, pin_name: str, net: Optional[Net] = None) -> Pin:
+        """Add a pin to this cell"""
+        pin = Pin(pin_name, net)
+        pin.cell = self
+        self.pins[pin_name] = pin
+        if self.parent_module is not None:
+            self.parent_module._dirty = True
+        return pin
+    
+    def get_pin(self, pin_name: str) -> Optional[Pin]:
+        """Get a pin by name"""
+        return self.pins.get(pin_name)
+    
+    def __repr__(self):
+        return f"Cell({self.name}, module={self.module_name})"
+
+
+class Module:
+    """Represents a module in the design"""
+
+    __slots__ = ('name', 'keyword', 'ports', 'nets', 'cells', 'parameters',
+                 'parent_netlist', 'is_top', 'filename', 'line',
+                 '_dirty', '_cached_text')
+
+    def __init__(self, name: str, keyword: str = 'module'):
+        self.name = sys.intern(name)
+        self.keyword = sys.intern(keyword)
+        self.ports = {}  # Dictionary of port name -> Port object
+        self.nets = {}  # Dictionary of net name -> Net object
+        self.cells = {}  # Dictionary of cell name -> Cell object
+        self.parameters = {}  # Dictionary of parameter name -> value
+        self.parent_netlist = None  # Reference to parent netlist
+        self.is_top = False
+        self.filename = None
+        self.line = 0
+        self._dirty = True  # Re-render verilog text on next emission
+        self._cached_text = None  # Last rendered verilog text
+
+    def __getstate__(self):
+        # Drop the netlist backref: it would drag the netlist's parser
+        # callbacks into the pickle. The owning netlist restores it.
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state['parent_netlist'] = None
+        return state
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+    def add_port(self, name: str, direction: str, width: int = 1) -> Port:
+        """Add a port to this module"""
+        port = Port(name, direction, width)
+        self.ports[name] = port
+        self._dirty = True
+        return port
+    
+    def add_net(self, name: str, net_type: str = 'wire', width: int = 1) -> Net:
+        """Add a net to this module"""
+        net = Net(name, net_type, width)
+        self.nets[name] = net
+        self._dirty = True
+        return net
+    
+    def add_cell(self, name: str, module_name: str) -> Cell:
+        """Add a cell to this module"""
+        cell = Cell(name, module_name)
+        cell.parent_module = self
+        self.cells[name] = cell
+        self._dirty = True
+        return cell
+    
+    def add_parameter(self, name: str, value: str):
+        """Add a parameter to this module"""
+        self.parameters[name] = value
+        self._dirty = True
+
+    def add_ports_bulk(self, specs) -> None:
+        """Add many ports at once from (name, direction, width) tuples"""
+        port_class = Port
+        self.ports.update((name, port_class(name, direction, width))
+                          for name, direction, width in specs)
+        self._dirty = True
+
+    def add_nets_bulk(self, specs) -> None:
+        """Add many nets at once from (name, net_type, width) tuples"""
+        net_class = Net
+        self.nets.update((name, net_class(name, net_type, width))
+                         for name, net_type, width in specs)
+        self._dirty = True
+
+    def add_cells_bulk(self, specs) -> None:
+        """Add many cells at once from (name, module_name) tuples"""
+        cell_class = Cell
+        cells = self.cells
+        for name, module_name in specs:
+            cell = cell_class(name, module_name)
+            cell.parent_module = self
+            cells[name] = cell
+        self._dirty = True
+    
+    def get_port(self, name: str) -> Optional[Port]:
+        """Get a port by name"""
+        return self.ports.get(name)
+    
+    def get_net(self, name: str) -> Optional[Net]:
+        """Get a net by name"""
+        return self.nets.get(name)
+    
+    def get_cell(self, name: str) -> Optional[Cell]:
+        """Get a cell by name"""
+        return self.cells.get(name)
+    
+    def __repr__(self):
+        return f"Module({self.name}, ports={len(self.ports)}, nets={len(self.nets)}, cells={len(self.cells)})"
+
+    def link(self, missing: Optional[Set[str]] = None):
+        """Link a module's cells to their actual modules
+
+        Unresolvable module names are collected into missing when given
+        (so the caller can batch warnings), otherwise warned about
+        directly.  Returns True if any cell is still unresolved.
+        """
+        netlist = self.parent_netlist
+        modules = netlist.modules
+        refcount = netlist._inst_refcount
+        unresolved = False
+        for cell_name, cell in self.cells.items():
+            if cell.module is not None:
+                continue
+            cell.module = target = modules.get(cell.module_name)
+            if target is None:
+                unresolved = True
+                if missing is not None:
+                    missing.add(cell.module_name)
+                else:
+                    log.warning("Module %s not found for cell %s",
+                                cell.module_name, cell_name)
+            else:
+                refcount[target.name] += 1
+        return unresolved
+
+
+class Netlist:
+    """Main netlist class that manages the entire design hierarchy"""
+    
+    def __init__(self, options: Optional[Any] = None):
+        """Initialize netlist with options"""
+        self.modules = {}  # Dictionary of module name -> Module object
+        self.files = {}  # Dictionary of filename -> file info
+        self.options = options
+        self.preproc = Preproc()
+        self.parser = SigParser()
+        self.language = Language()
+        
+        # Configuration options
+        self.implicit_wires_ok = True
+        self.link_read = True
+        self.use_vars = True
+        self.keep_comments = False
+        self.synthesis = False
+        self.cache_dir = None  # Set to a directory to cache parse results
+        
+        # Internal state
+        self._need_link = []
+        self._inst_refcount = Counter()  # module name -> linked cell count
+        self._warned_missing = set()  # module names already warned about
+    
+    def read_file(self, filename: str) -> None:
+        """Read a Verilog file and add its modules to the netlist"""
+        try:
+            # With cache_dir set, unchanged files (same path, mtime, size
+            # and defines) skip preprocessing and parsing entirely
+            cache_path = None
+            if self.cache_dir:
+                key = _parse_cache_key(filename, self.preproc.defines)
+                cache_path = os.path.join(self.cache_dir, key + '.pkl')
+                cached = self._load_parse_cache(cache_path)
+                if (cached is not None and len(cached) == 4
+                        and self._stamps_current(cached[3])):
+                    content, module_infos, defines_delta, stamps = cached
+                    # Replay the define side effects preprocessing would
+                    # have had, so later files parse the same warm as cold
+                    changed, removed = defines_delta
+                    self.preproc.defines.update(changed)
+                    for name in removed:
+                        self.preproc.defines.pop(name, None)
+                    if changed or removed:
+                        self.preproc._defines_dirty = True
+                    self.preproc.included_files.update(
+                        path for path, _, _ in stamps)
+                    for module_info in module_infos:
+                        if module_info['name']:
+                            self._create_module_from_info(module_info,
+                                                          filename)
+                    self.files[filename] = {
+                        'modules': [],
+                        'content': content
+                    }
+                    return
+
+            # Preprocess the file, snapshotting the preprocessor state so
+            # the cache can carry this file's define and include effects
+            defines_before = dict(self.preproc.defines)
+            includes_before = set(self.preproc.included_files)
+            preprocessed_content = self.preproc.preprocess_file(filename)
+
+            if cache_path is not None:
+                # Build modules from the same per-module info list that
+                # gets cached, so cold and cached runs agree exactly
+                module_infos = _collect_module_infos(self.parser,
+                                                     preprocessed_content)
+                for module_info in module_infos:
+                    if module_info['name']:
+                        self._create_module_from_info(module_info, filename)
+            else:
+                # Parse the preprocessed content
+                self._parse_file_content(preprocessed_content, filename)
+
+            # Track the file
+            self.files[filename] = {
+                'modules': [],
+                'content': preprocessed_content
+            }
+
+            if cache_path is not None:
+                defines = self.preproc.defines
+                changed = {name: value for name, value in defines.items()
+                           if name not in defines_before
+                           or defines_before[name] != value}
+                removed = [name for name in defines_before
+                           if name not in defines]
+                stamps = self._stamp_files(
+                    self.preproc.included_files - includes_before)
+                if stamps is not None:
+                    self._store_parse_cache(cache_path, preprocessed_content,
+                                            module_infos, (changed, removed),
+                                            stamps)
+
+        except FileNotFoundError:
+            log.warning("File not found: %s", filename)
+        except Exception as e:
+            log.error("Error reading file %s: %s", filename, e)
+
+    @staticmethod
+    def _stamp_files(paths) -> Optional[List[Tuple[str, int, int]]]:
+        """Build (path, mtime_ns, size) stamps, or None if any is gone"""
+        stamps = []
+        for path in sorted(paths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+        return stamps
+
+    @staticmethod
+    def _stamps_current(stamps) -> bool:
+        """Check that every stamped file still matches on disk"""
+        for path, mtime_ns, size in stamps:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+                return False
+        return True
+
+    @staticmethod
+    def _load_parse_cache(cache_path: str):
+        """Load a cached parse payload, or None
+
+        The payload is (content, module info list, defines delta,
+        include stamps); the delta replays define side effects and the
+        stamps invalidate the entry when an included header changes.
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _store_parse_cache(self, cache_path: str, content: str,
+                           module_infos: List[Dict[str, Any]],
+                           defines_delta: Tuple[Dict[str, str], List[str]],
+                           include_stamps: List[Tuple[str, int, int]]) -> None:
+        """Store a parse payload in the cache, best effort"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((content, module_infos, defines_delta,
+                             include_stamps), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+
+    def read_files(self, filenames: List[str],
+                   workers: Optional[int] = None) -> None:
+        """Read many Verilog files, parsing them in parallel processes.
+
+        Preprocessing and parsing are independent per file, so they are
+        farmed out to a process pool and the resulting module info is
+        merged serially; call link() once afterwards as usual.
+        """
+        jobs = [(filename, self.preproc.defines, self.preproc.include_paths)
+                for filename in filenames]
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            for filename, content, module_infos, includes, error in \
+                    executor.map(_parse_one_file, jobs, chunksize=8):
+                if error is not None:
+                    log.error("Error reading file %s: %s", filename, error)
+                    continue
+                # Workers preprocess with their own Preproc; fold their
+                # resolved includes back so callers see the full set
+                self.preproc.included_files.update(includes)
+                for module_info in module_infos:
+                    if module_info['name']:
+                        self._create_module_from_info(module_info, filename)
+                self.files[filename] = {
+                    'modules': [],
+                    'content': content
+                }
+    
+    def _parse_file_content(self, content: str, filename: str) -> None:
+        """Parse the content of a file and extract modules"""
+        # Build modules directly as the callbacks fire instead of
+        # walking the parser's intermediate module_info dict afterwards
+        current = None
+
+        def on_module_begin(name: str, line: int) -> None:
+            nonlocal current
+            current = Module(name)
+            current.filename = filename
+            current.line = line
+
+        def on_module_end() -> None:
+            nonlocal current
+            if current is not None:
+                self._register_module(current)
+                current = None
+
+        def on_signal_declaration(signal_type: str, name: str,
+                                  type_info: str, line: int) -> None:
+            if current is None:
+                return
+            if signal_type == 'port':
+                current.add_port(name, type_info)
+            else:
+                current.add_net(name, type_info)
+
+        def on_parameter_declaration(name: str, line: int) -> None:
+            if current is not None:
+                current.add_parameter(name, '1')
+
+        self.parser.callbacks = {
+            'module_begin': on_module_begin,
+            'module_end': on_module_end,
+            'signal_declaration': on_signal_declaration,
+            'parameter_declaration': on_parameter_declaration,
+        }
+        self.parser.parse(content)
+
+        # A missing endmodule still registers what was collected
+        if current is not None:
+            self._register_module(current)
+
+    def _register_module(self, module: Module) -> None:
+        """Add a built module to the netlist and queue it for linking"""
+        self.modules[module.name] = module
+        module.parent_netlist = self
+        self._need_link.append(module)
+
+    def _create_module_from_info(self, module_info: Dict[str, Any], filename: str) -> None:
+        """Create a module from parser information"""
+        module_name = module_info['name']
+        module = Module(module_name)
+        module.filename = filename
+        
+        # Add ports and nets in bulk (width defaults to 1; it could be
+        # parsed from the declaration)
+        module.add_ports_bulk((port_info['name'], port_info['direction'], 1)
+                              for port_info in module_info['ports'])
+        module.add_nets_bulk((net_info['name'], net_info['type'], 1)
+                             for net_info in module_info['nets'])
+
+        # Add parameters with a default value
+        module.parameters.update((param_info['name'], '1')
+                                 for param_info in module_info['parameters'])
+        
+        self._register_module(module)
+    
+    def link(self) -> None:
+        """Link all modules in the netlist"""
+        # Visit each pending module exactly once; Module.link skips
+        # already-resolved cells, so nothing is relinked.  Modules with
+        # unresolved references stay queued and are retried on the next
+        # link() after more files have been read.
+        missing: Set[str] = set()
+        retry = []
+        while self._need_link:
+            module = self._need_link.pop()
+            if module.link(missing):
+                retry.append(module)
+        self._need_link.extend(retry)
+
+        # One warning per missing module, not one per referencing cell,
+        # and never repeated on later link calls
+        missing -= self._warned_missing
+        self._warned_missing |= missing
+        for module_name in sorted(missing):
+            log.warning("Module %s not found", module_name)
+    
+    def find_module(self, name: str) -> Optional[Module]:
+        """Find a module by name"""
+        return self.modules.get(name)
+    
+    def iter_modules(self):
+        """Iterate over all modules without building a list"""
+        return iter(self.modules.values())
+
+    def iter_top_modules(self):
+        """Iterate over top-level modules without building a list"""
+        # The instantiation counts are maintained incrementally as cells
+        # are linked, so this is a single set-difference over the modules
+        instantiated_modules = self._inst_refcount
+        return (module for module in self.modules.values()
+                if module.name not in instantiated_modules)
+
+    def get_modules(self) -> List[Module]:
+        """Get all modules in the netlist"""
+        return list(self.iter_modules())
+
+    def get_top_modules(self) -> List[Module]:
+        """Get top-level modules (those not instantiated by other modules)"""
+        return list(self.iter_top_modules())
+    
+    def dump(self) -> None:
+        """Dump the netlist structure for debugging"""
+        # Batch the report into one string instead of one print per line
+        parts = ["Netlist Dump:", "============="]
+        append = parts.append
+
+        for module_name, module in self.modules.items():
+            append(f"\nModule: {module_name}")
+            append(f"  Ports: {len(module.ports)}")
+            for port_name, port in module.ports.items():
+                append(f"    {port.direction} {port_name}")
+
+            append(f"  Nets: {len(module.nets)}")
+            for net_name, net in module.nets.items():
+                append(f"    {net.net_type} {net_name}")
+
+            append(f"  Cells: {len(module.cells)}")
+            for cell_name, cell in module.cells.items():
+                append(f"    {cell_name} ({cell.module_name})")
+
+        print("\n".join(parts))
+
+    def verilog_text(self) -> str:
+        """Generate Verilog text representation of the netlist"""
+        # Modules that have not changed since the last call reuse their
+        # cached rendering; only dirty ones are re-emitted
+        chunks = []
+        for module in self.modules.values():
+            if module._dirty or module._cached_text is None:
+                module._cached_text = self._render_module(module)
+                module._dirty = False
+            chunks.append(module._cached_text)
+        return "".join(chunks)
+
+    @staticmethod
+    def _render_module(module: Module) -> str:
+        """Render one module's Verilog text"""
+        # Emit into one flat parts list with a single terminal join;
+        # no per-cell intermediate strings are built
+        parts = []
+        w = parts.append
+
+        w(f"module {module.name} (\n")
+
+        # Port declarations
+        if module.ports:
+            w("  ")
+            w(", ".join(module.ports))
+            w("\n")
+        w(");\n")
+
+        # Port directions
+        ports = module.ports
+        for port_name, port in ports.items():
+            w(f"  {port.direction} {port_name};\n")
+
+        # Net declarations
+        for net_name, net in module.nets.items():
+            if net_name not in ports:
+                w(f"  {net.net_type} {net_name};\n")
+
+        # Cell instantiations
+        for cell_name, cell in module.cells.items():
+            w(f"  {cell.module_name} {cell_name} (\n")
+            first = True
+            for pin_name, pin in cell.pins.items():
+                if pin.net is None:
+                    continue
+                if not first:
+                    w(",\n")
+                w(f"    .{pin_name}({pin.net.name})")
+                first = False
+            w("\n  );\n")
+
+        w("endmodule\n\n")
+
+        return "".join(parts) 
\ No newline at end of file
@@ -1,384 +1,604 @@
-"""
-Verilog::Parser - Verilog parser and tokenizer
-
-This module provides tokenization and parsing of Verilog files,
-with callback support for various language constructs.
-"""
-
-import re
-from typing import List, Dict, Optional, Callable, Any, Tuple
-from enum import Enum, auto
-
-
-class TokenType(Enum):
-    """Token types for Verilog parsing"""
-    KEYWORD = auto()
-    IDENTIFIER = auto()
-    NUMBER = auto()
-    STRING = auto()
-    OPERATOR = auto()
-    DELIMITER = auto()
-    DIRECTIVE = auto()
-    COMMENT = auto()
-    WHITESPACE = auto()
-    NEWLINE = auto()
-    EOF = auto()
-
-
-class Token:
-    """Represents a token in the Verilog source"""
-    
-    def __init__(self, type_: TokenType, value: str, line: int, column: int):
-        self.type = type_
-        self.value = value
-        self.line = line
-        self.column = column
-    
-    def __repr__(self):
-        return f"Token({self.type.name}, '{self.value}', line={self.line}, col={self.column})"
-
-
-class Parser:
-    """Verilog parser with tokenization and callback support"""
-    
-    def __init__(self, callbacks: Optional[Dict[str, Callable]] = None):
-        """Initialize parser with optional callbacks"""
-        self.callbacks = callbacks or {}
-        self.tokens = []
-        self.current_token = 0
-        self.line = 1
-        self.column = 1
-        
-        # Token patterns
-        self.patterns = [
-            (TokenType.COMMENT, r'//.*$|/\*.*?\*/'),
-            (TokenType.STRING, r'"[^"]*"'),
-            (TokenType.NUMBER, r'\d+\'[bdh][0-9a-fA-F_xXzZ]+|\d+'),
-            (TokenType.DIRECTIVE, r'`\w+'),
-            (TokenType.KEYWORD, r'\b(module|endmodule|input|output|inout|wire|reg|always|assign|begin|end|if|else|case|endcase|for|while|function|endfunction|task|endtask|parameter|localparam|integer|real|time|initial|final)\b'),
-            (TokenType.IDENTIFIER, r'\b[a-zA-Z_][a-zA-Z0-9_$]*\b'),
-            (TokenType.OPERATOR, r'[+\-*/%<>=!&|^~]+'),
-            (TokenType.DELIMITER, r'[(){}\[\];,.#:]'),
-            (TokenType.WHITESPACE, r'\s+'),
-        ]
-        
-        # Compile patterns
-        self.compiled_patterns = []
-        for token_type, pattern in self.patterns:
-            self.compiled_patterns.append((token_type, re.compile(pattern)))
-    
-    def tokenize(self, text: str) -> List[Token]:
-        """Tokenize Verilog text into tokens"""
-        self.tokens = []
-        self.current_token = 0
-        self.line = 1
-        self.column = 1
-        
-        pos = 0
-        while pos < len(text):
-            token = self._next_token(text, pos)
-            if token:
-                self.tokens.append(token)
-                pos += len(token.value)
-                if token.type == TokenType.NEWLINE:
-                    self.line += 1
-                    self.column = 1
-                else:
-                    self.column += len(token.value)
-            else:
-                # Skip unknown characters
-                pos += 1
-                self.column += 1
-        
-        # Add EOF token
-        self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
-        return self.tokens
-    
-    def _next_token(self, text: str, pos: int) -> Optional[Token]:
-        """Get the next token from the text starting at pos"""
-        remaining = text[pos:]
-        
-        for token_type, pattern in self.compiled_patterns:
-            match = pattern.match(remaining)
-            if match:
-                value = match.group(0)
-                
-                # Handle comments specially
-                if token_type == TokenType.COMMENT:
-                    if value.startswith('//'):
-                        # Single line comment
-                        return Token(TokenType.COMMENT, value, self.line, self.column)
-                    else:
-                        # Multi-line comment
-                        lines = value.count('\n')
-                        return Token(TokenType.COMMENT, value, self.line, self.column)
-                
-                # Handle whitespace
-                if token_type == TokenType.WHITESPACE:
-                    if '\n' in value:
-                        return Token(TokenType.NEWLINE, '\n', self.line, self.column)
-                    else:
-                        return Token(TokenType.WHITESPACE, value, self.line, self.column)
-                
-                return Token(token_type, value, self.line, self.column)
-        
-        return None
-    
-    def parse(self, text: str) -> None:
-        """Parse Verilog text and invoke callbacks"""
-        self.tokenize(text)
-        self.current_token = 0
-        
-        while self.current_token < len(self.tokens):
-            token = self.tokens[self.current_token]
-            
-            if token.type == TokenType.EOF:
-                break
-            
-            # Handle different token types
-            if token.type == TokenType.KEYWORD:
-                self._handle_keyword(token)
-            elif token.type == TokenType.DIRECTIVE:
-                self._handle_directive(token)
-            elif token.type == TokenType.IDENTIFIER:
-                self._handle_identifier(token)
-            
-            self.current_token += 1
-    
-    def _handle_keyword(self, token: Token) -> None:
-        """Handle keyword tokens"""
-        keyword = token.value.lower()
-        
-        if keyword == 'module':
-            self._parse_module()
-        elif keyword == 'endmodule':
-            self._parse_endmodule()
-        elif keyword in ['input', 'output', 'inout']:
-            self._parse_port_declaration(token)
-        elif keyword in ['wire', 'reg']:
-            self._parse_net_declaration(token)
-        elif keyword == 'always':
-            self._parse_always()
-        elif keyword == 'assign':
-            self._parse_assign()
-        elif keyword == 'parameter':
-            self._parse_parameter()
-    
-    def _handle_directive(self, token: Token) -> None:
-        """Handle directive tokens"""
-        directive = token.value[1:]  # Remove backtick
-        if 'directive' in self.callbacks:
-            self.callbacks['directive'](directive, token.line, token.column)
-    
-    def _handle_identifier(self, token: Token) -> None:
-        """Handle identifier tokens"""
-        if 'identifier' in self.callbacks:
-            self.callbacks['identifier'](token.value, token.line, token.column)
-    
-    def _parse_module(self) -> None:
-        """Parse module declaration"""
-        if 'module_begin' not in self.callbacks:
-            return
-        
-        # Skip to module name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            module_name = self.tokens[self.current_token].value
-            self.callbacks['module_begin'](module_name, self.tokens[self.current_token].line)
-    
-    def _parse_endmodule(self) -> None:
-        """Parse endmodule"""
-        if 'module_end' in self.callbacks:
-            self.callbacks['module_end']()
-    
-    def _parse_port_declaration(self, token: Token) -> None:
-        """Parse port declaration (input/output/inout)"""
-        if 'port_declaration' not in self.callbacks:
-            return
-        
-        direction = token.value.lower()
-        
-        # Skip to port name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            port_name = self.tokens[self.current_token].value
-            self.callbacks['port_declaration'](direction, port_name, token.line)
-    
-    def _parse_net_declaration(self, token: Token) -> None:
-        """Parse net declaration (wire/reg)"""
-        if 'net_declaration' not in self.callbacks:
-            return
-        
-        net_type = token.value.lower()
-        
-        # Skip to net name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            net_name = self.tokens[self.current_token].value
-            self.callbacks['net_declaration'](net_type, net_name, token.line)
-    
-    def _parse_always(self) -> None:
-        """Parse always block"""
-        if 'always_begin' in self.callbacks:
-            self.callbacks['always_begin'](self.tokens[self.current_token].line)
-    
-    def _parse_assign(self) -> None:
-        """Parse assign statement"""
-        if 'assign' in self.callbacks:
-            self.callbacks['assign'](self.tokens[self.current_token].line)
-    
-    def _parse_parameter(self) -> None:
-        """Parse parameter declaration"""
-        if 'parameter' not in self.callbacks:
-            return
-        
-        # Skip to parameter name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            param_name = self.tokens[self.current_token].value
-            self.callbacks['parameter'](param_name, self.tokens[self.current_token].line)
-    
-    def get_tokens(self) -> List[Token]:
-        """Get the list of tokens"""
-        return self.tokens.copy()
-    
-    def peek(self, offset: int = 0) -> Optional[Token]:
-        """Peek at a token without consuming it"""
-        index = self.current_token + offset
-        if 0 <= index < len(self.tokens):
-            return self.tokens[index]
-        return None
-    
-    def consume(self, expected_type: Optional[TokenType] = None, 
-                expected_value: Optional[str] = None) -> Optional[Token]:
-        """Consume a token, optionally checking type and value"""
-        if self.current_token >= len(self.tokens):
-            return None
-        
-        token = self.tokens[self.current_token]
-        
-        if expected_type and token.type != expected_type:
-            return None
-        
-        if expected_value and token.value != expected_value:
-            return None
-        
-        self.current_token += 1
-        return token
-
-
-class SigParser(Parser):
-    """Signal parser that builds upon Parser to provide signal-specific callbacks"""
-    
-    def __init__(self, callbacks: Optional[Dict[str, Callable]] = None):
-        """Initialize signal parser"""
-        super().__init__(callbacks)
-        self.current_module = None
-        self.current_ports = []
-        self.current_nets = []
-        self.current_parameters = []
-    
-    def _parse_module(self) -> None:
-        """Parse module declaration with signal tracking"""
-        super()._parse_module()
-        
-        # Reset module state
-        self.current_module = None
-        self.current_ports = []
-        self.current_nets = []
-        self.current_parameters = []
-        
-        # Get module name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            self.current_module = self.tokens[self.current_token].value
-    
-    def _parse_port_declaration(self, token: Token) -> None:
-        """Parse port declaration with signal tracking"""
-        super()._parse_port_declaration(token)
-        
-        direction = token.value.lower()
-        
-        # Get port name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            port_name = self.tokens[self.current_token].value
-            port_info = {
-                'name': port_name,
-                'direction': direction,
-                'line': token.line
-            }
-            self.current_ports.append(port_info)
-            
-            if 'signal_declaration' in self.callbacks:
-                self.callbacks['signal_declaration']('port', port_name, direction, token.line)
-    
-    def _parse_net_declaration(self, token: Token) -> None:
-        """Parse net declaration with signal tracking"""
-        super()._parse_net_declaration(token)
-        
-        net_type = token.value.lower()
-        
-        # Get net name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            net_name = self.tokens[self.current_token].value
-            net_info = {
-                'name': net_name,
-                'type': net_type,
-                'line': token.line
-            }
-            self.current_nets.append(net_info)
-            
-            if 'signal_declaration' in self.callbacks:
-                self.callbacks['signal_declaration']('net', net_name, net_type, token.line)
-    
-    def _parse_parameter(self) -> None:
-        """Parse parameter declaration with signal tracking"""
-        super()._parse_parameter()
-        
-        # Get parameter name
-        while (self.current_token < len(self.tokens) and 
-               self.tokens[self.current_token].type != TokenType.IDENTIFIER):
-            self.current_token += 1
-        
-        if self.current_token < len(self.tokens):
-            param_name = self.tokens[self.current_token].value
-            param_info = {
-                'name': param_name,
-                'line': self.tokens[self.current_token].line
-            }
-            self.current_parameters.append(param_info)
-            
-            if 'parameter_declaration' in self.callbacks:
-                self.callbacks['parameter_declaration'](param_name, self.tokens[self.current_token].line)
-    
-    def get_module_info(self) -> Dict[str, Any]:
-        """Get information about the current module"""
-        return {
-            'name': self.current_module,
-            'ports': self.current_ports,
-            'nets': self.current_nets,
-            'parameters': self.current_parameters
+"""
+Verilog::Parser - Verilog parser and tokenizer
+
+This module provides tokenization and parsing of Verilog files,
+with callback support for various language constructs.
+"""
+
+import re
+import sys
+from array import array
+from typing import List, Dict, Optional, Callable, Any, Tuple
+from enum import Enum, auto
+
+
+class TokenType(Enum):
+    """Token types for Verilog parsing"""
+    KEYWORD = auto()
+    IDENTIFIER = auto()
+    NUMBER = auto()
+    STRING = auto()
+    OPERATOR = auto()
+    DELIMITER = auto()
+    DIRECTIVE = auto()
+    COMMENT = auto()
+    WHITESPACE = auto()
+    NEWLINE = auto()
+    EOF = auto()
+
+
+class Token:
+    """Represents a token in the Verilog source"""
+
+    __slots__ = ('type', 'value', 'line', 'column')
+
+    def __init__(self, type_: TokenType, value: str, line: int, column: int):
+        self.type = type_
+        self.value = value
+        self.line = line
+        self.column = column
+
+    def __repr__(self):
+        return f"Token({self.type.name}, '{self.value}', line={self.line}, col={self.column})"
+
+
+# Master tokenizer pattern, compiled once at import.  Alternatives are
+# ordered so comments win over operators; unknown characters simply fall
+# between matches and are skipped.  Keywords match as identifiers and are
+# reclassified with one set lookup afterwards, which beats walking a
+# 26-way literal alternation at every identifier position.
+_MASTER_RE = re.compile(
+    r'(?P<COMMENT>//[^\n]*|/\*[^*]*(?:\*(?!/)[^*]*)*\*/)'
+    r'|(?P<STRING>"[^"]*")'
+    r"|(?P<NUMBER>\d+'[bdh][0-9a-fA-F_xXzZ]+|\d+)"
+    r'|(?P<DIRECTIVE>`\w+)'
+    r'|(?P<IDENTIFIER>\b[a-zA-Z_][a-zA-Z0-9_$]*\b)'
+    r'|(?P<OPERATOR>[+\-*/%<>=!&|^~]+)'
+    r'|(?P<DELIMITER>[(){}\[\];,.#:])'
+    r'|(?P<NEWLINE>\n)'
+    r'|(?P<WHITESPACE>[^\S\n]+)'
+)
+
+# The keywords the parser reacts to, interned to match the token values
+_KEYWORD_SET = frozenset(map(sys.intern, (
+    'module', 'endmodule', 'input', 'output', 'inout', 'wire', 'reg',
+    'always', 'assign', 'begin', 'end', 'if', 'else', 'case', 'endcase',
+    'for', 'while', 'function', 'endfunction', 'task', 'endtask',
+    'parameter', 'localparam', 'integer', 'real', 'time', 'initial',
+    'final',
+)))
+
+# Map regex group names to plain int type ids without per-token Enum lookup
+_KIND = {token_type.name: token_type.value for token_type in TokenType}
+_TYPE_BY_ID = {token_type.value: token_type for token_type in TokenType}
+
+# Int ids used for raw comparisons in the hot parser loops
+_KEYWORD_ID = TokenType.KEYWORD.value
+_IDENTIFIER_ID = TokenType.IDENTIFIER.value
+_DIRECTIVE_ID = TokenType.DIRECTIVE.value
+_WHITESPACE_ID = TokenType.WHITESPACE.value
+_NEWLINE_ID = TokenType.NEWLINE.value
+_EOF_ID = TokenType.EOF.value
+
+
+class TokenStream:
+    """Struct-of-arrays token storage.
+
+    Token fields live in parallel arrays (one small int per type id,
+    machine ints for line/column, plus the value strings) instead of one
+    Token object per token, which cuts per-token memory and lets the
+    parser loops compare plain ints.  Indexing lazily materializes a
+    Token for callers that expect objects.
+    """
+
+    __slots__ = ('types', 'values', 'lines', 'columns')
+
+    def __init__(self):
+        self.types = array('b')
+        self.values = []
+        self.lines = array('l')
+        self.columns = array('l')
+
+    def append(self, type_id: int, value: str, line: int, column: int) -> None:
+        """Append one token's fields"""
+        self.types.append(type_id)
+        self.values.append(value)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.values)))]
+        return Token(_TYPE_BY_ID[self.types[index]], self.values[index],
+                     self.lines[index], self.columns[index])
+
+    def copy(self) -> 'TokenStream':
+        """Return a shallow copy of the stream"""
+        stream = TokenStream()
+        stream.types = self.types[:]
+        stream.values = self.values[:]
+        stream.lines = self.lines[:]
+        stream.columns = self.columns[:]
+        return stream
+
+
+class Parser:
+    """Verilog parser with tokenization and callback support"""
+    
+    def __init__(self, callbacks: Optional[Dict[str, Callable]] = None):
+        """Initialize parser with optional callbacks"""
+        self.callbacks = callbacks or {}
+        self.tokens = TokenStream()
+        self.current_token = 0
+        self.line = 1
+        self.column = 1
+
+        # Keyword dispatch table; one dict lookup instead of a
+        # comparison chain per keyword occurrence
+        self._kw_handlers = {
+            'module': lambda token: self._parse_module(),
+            'endmodule': lambda token: self._parse_endmodule(),
+            'input': self._parse_port_declaration,
+            'output': self._parse_port_declaration,
+            'inout': self._parse_port_declaration,
+            'wire': self._parse_net_declaration,
+            'reg': self._parse_net_declaration,
+            'always': lambda token: self._parse_always(),
+            'assign': lambda token: self._parse_assign(),
+            'parameter': lambda token: self._parse_parameter(),
+        }
+
+    def tokenize(self, text: str, keep_trivia: bool = False) -> TokenStream:
+        """Tokenize Verilog text into a token stream.
+
+        Whitespace and newline tokens are dropped by default since the
+        parser never consumes them; pass keep_trivia=True (or use
+        tokenize_with_trivia) to keep them.
+        """
+        self.tokens = TokenStream()
+        self.current_token = 0
+        self.line = 1
+        self.column = 1
+
+        # The regex engine runs the scan itself as a compiled automaton in C;
+        # keep the per-token Python work minimal by binding the stream's
+        # column appends and the lookup tables as locals.
+        tokens = self.tokens
+        kinds = _KIND
+        intern = sys.intern
+        types_append = tokens.types.append
+        values_append = tokens.values.append
+        lines_append = tokens.lines.append
+        columns_append = tokens.columns.append
+        line = 1
+        line_start = 0
+        for match in _MASTER_RE.finditer(text):
+            value = match.group()
+            type_id = kinds[match.lastgroup]
+            if keep_trivia or (type_id != _WHITESPACE_ID and
+                               type_id != _NEWLINE_ID):
+                # Intern names so repeated identifiers share one string and
+                # later comparisons reduce to pointer equality, then
+                # reclassify keywords with a single set lookup
+                if type_id == _IDENTIFIER_ID:
+                    value = intern(value)
+                    if value in _KEYWORD_SET:
+                        type_id = _KEYWORD_ID
+                types_append(type_id)
+                values_append(value)
+                lines_append(line)
+                columns_append(match.start() - line_start + 1)
+            # Track (line, column) by counting newlines per match rather
+            # than per character
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                line_start = match.start() + value.rindex('\n') + 1
+
+        # Add EOF token
+        self.line = line
+        self.column = len(text) - line_start + 1
+        tokens.append(_EOF_ID, '', self.line, self.column)
+        return tokens
+
+    def tokenize_with_trivia(self, text: str) -> TokenStream:
+        """Tokenize Verilog text, keeping whitespace and newline tokens"""
+        return self.tokenize(text, keep_trivia=True)
+    
+    def parse(self, text: str) -> None:
+        """Parse Verilog text and invoke callbacks"""
+        self.tokenize(text)
+        self.current_token = 0
+
+        # Walk a local index and only sync self.current_token around
+        # handler calls, which may themselves advance it; uninteresting
+        # tokens are skipped with plain local arithmetic.
+        stream = self.tokens
+        types = stream.types
+        count = len(stream)
+        pos = 0
+        while pos < count:
+            type_id = types[pos]
+
+            if type_id == _EOF_ID:
+                break
+
+            if type_id == _KEYWORD_ID:
+                self.current_token = pos
+                self._handle_keyword(stream[pos])
+                pos = self.current_token
+            elif type_id == _DIRECTIVE_ID:
+                self.current_token = pos
+                self._handle_directive(stream[pos])
+                pos = self.current_token
+            elif type_id == _IDENTIFIER_ID:
+                self.current_token = pos
+                self._handle_identifier(stream[pos])
+                pos = self.current_token
+
+            pos += 1
+
+        self.current_token = pos
+    
+    def _handle_keyword(self, token: Token) -> None:
+        """Handle keyword tokens"""
+        # Keywords are classified case-sensitively by the tokenizer, so
+        # no per-token lower() is needed before the table lookup
+        handler = self._kw_handlers.get(token.value)
+        if handler is not None:
+            handler(token)
+    
+    def _handle_directive(self, token: Token) -> None:
+        """Handle directive tokens"""
+        directive = token.value[1:]  # Remove backtick
+        if 'directive' in self.callbacks:
+            self.callbacks['directive'](directive, token.line, token.column)
+    
+    def _handle_identifier(self, token: Token) -> None:
+        """Handle identifier tokens"""
+        if 'identifier' in self.callbacks:
+            self.callbacks['identifier'](token.value, token.line, token.column)
+    
+    def _advance_to_identifier(self) -> Optional[int]:
+        """Advance current_token to the next identifier, returning its index
+
+        The _parse_* methods share this scan and pass the index along so
+        the name each declaration found is never searched for twice.
+        """
+        stream = self.tokens
+        types = stream.types
+        count = len(stream)
+        index = self.current_token
+        while index < count and types[index] != _IDENTIFIER_ID:
+            index += 1
+        if index >= count:
+            return None
+        self.current_token = index
+        return index
+
+    def _parse_module(self) -> Optional[int]:
+        """Parse module declaration; returns the name token's index"""
+        if 'module_begin' not in self.callbacks:
+            return None
+
+        index = self._advance_to_identifier()
+        if index is not None:
+            stream = self.tokens
+            self.callbacks['module_begin'](stream.values[index],
+                                           stream.lines[index])
+        return index
+
+    def _parse_endmodule(self) -> None:
+        """Parse endmodule"""
+        if 'module_end' in self.callbacks:
+            self.callbacks['module_end']()
+
+    def _parse_port_declaration(self, token: Token) -> Optional[int]:
+        """Parse port declaration; returns the name token's index"""
+        if 'port_declaration' not in self.callbacks:
+            return None
+
+        index = self._advance_to_identifier()
+        if index is not None:
+            direction = token.value.lower()
+            self.callbacks['port_declaration'](direction,
+                                               self.tokens.values[index],
+                                               token.line)
+        return index
+
+    def _parse_net_declaration(self, token: Token) -> Optional[int]:
+        """Parse net declaration; returns the name token's index"""
+        if 'net_declaration' not in self.callbacks:
+            return None
+
+        index = self._advance_to_identifier()
+        if index is not None:
+            net_type = token.value.lower()
+            self.callbacks['net_declaration'](net_type,
+                                              self.tokens.values[index],
+                                              token.line)
+        return index
+
+    def _parse_always(self) -> None:
+        """Parse always block"""
+        if 'always_begin' in self.callbacks:
+            self.callbacks['always_begin'](self.tokens.lines[self.current_token])
+
+    def _parse_assign(self) -> None:
+        """Parse assign statement"""
+        if 'assign' in self.callbacks:
+            self.callbacks['assign'](self.tokens.lines[self.current_token])
+
+    def _parse_parameter(self) -> Optional[int]:
+        """Parse parameter declaration; returns the name token's index"""
+        if 'parameter' not in self.callbacks:
+            return None
+
+        index = self._advance_to_identifier()
+        if index is not None:
+            stream = self.tokens
+            self.callbacks['parameter'](stream.values[index],
+                                        stream.lines[index])
+        return index
+
+    def get_tokens(self) -> TokenStream:
+        """Get the token stream (a live view, not a copy)"""
+        return self.tokens
+
+    def get_tokens_copy(self) -> TokenStream:
+        """Get an independent copy of the token stream"""
+        return self.tokens.copy()
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        """Peek at a token without consuming it"""
+        index = self.current_token + offset
+        if 0 <= index < len(self.tokens):
+            return self.tokens[index]
+        return None
+
+    def consume(self, expected_type: Optional[TokenType] = None,
+                expected_value: Optional[str] = None) -> Optional[Token]:
+        """Consume a token, optionally checking type and value"""
+        stream = self.tokens
+        index = self.current_token
+        if index >= len(stream):
+            return None
+
+        # Check against the raw columns before materializing a Token
+        if expected_type and stream.types[index] != expected_type.value:
+            return None
+
+        if expected_value and stream.values[index] != expected_value:
+            return None
+
+        self.current_token += 1
+        return stream[index]
+
+
+class SigParser(Parser):
+    """Signal parser that builds upon Parser to provide signal-specific callbacks"""
+    
+    def __init__(self, callbacks: Optional[Dict[str, Callable]] = None):
+        """Initialize signal parser"""
+        super().__init__(callbacks)
+        self.current_module = None
+        self.current_ports = []
+        self.current_nets = []
+        self.current_parameters = []
+
+    def parse(self, text: str) -> None:
+        """Parse Verilog text in one pass, tracking signals as they appear.
+
+        The signal shapes SigParser extracts only need a flat scan, so the
+        per-production method dispatch of the base class is folded into a
+        single loop over the raw token columns.
+        """
+        self.tokenize(text)
+        self.current_token = 0
+
+        # Reset module state
+        self.current_module = None
+        self.current_ports = []
+        self.current_nets = []
+        self.current_parameters = []
+
+        callbacks = self.callbacks
+        stream = self.tokens
+        types = stream.types
+        values = stream.values
+        lines = stream.lines
+        columns = stream.columns
+        count = len(stream)
+        pos = 0
+        while pos < count:
+            type_id = types[pos]
+
+            if type_id == _EOF_ID:
+                break
+
+            if type_id == _KEYWORD_ID:
+                keyword = values[pos]
+                line = lines[pos]
+
+                if keyword == 'module':
+                    # Scan ahead to the module name
+                    scan = pos + 1
+                    while scan < count and types[scan] != _IDENTIFIER_ID:
+                        scan += 1
+                    self.current_module = None
+                    self.current_ports = []
+                    self.current_nets = []
+                    self.current_parameters = []
+                    if scan < count:
+                        self.current_module = values[scan]
+                        if 'module_begin' in callbacks:
+                            callbacks['module_begin'](values[scan], lines[scan])
+                    pos = scan
+
+                elif keyword in ('input', 'output', 'inout'):
+                    scan = pos + 1
+                    while scan < count and types[scan] != _IDENTIFIER_ID:
+                        scan += 1
+                    if scan < count:
+                        port_name = values[scan]
+                        if 'port_declaration' in callbacks:
+                            callbacks['port_declaration'](keyword, port_name, line)
+                        self.current_ports.append({
+                            'name': port_name,
+                            'direction': keyword,
+                            'line': line
+                        })
+                        if 'signal_declaration' in callbacks:
+                            callbacks['signal_declaration']('port', port_name,
+                                                            keyword, line)
+                    pos = scan
+
+                elif keyword in ('wire', 'reg'):
+                    scan = pos + 1
+                    while scan < count and types[scan] != _IDENTIFIER_ID:
+                        scan += 1
+                    if scan < count:
+                        net_name = values[scan]
+                        if 'net_declaration' in callbacks:
+                            callbacks['net_declaration'](keyword, net_name, line)
+                        self.current_nets.append({
+                            'name': net_name,
+                            'type': keyword,
+                            'line': line
+                        })
+                        if 'signal_declaration' in callbacks:
+                            callbacks['signal_declaration']('net', net_name,
+                                                            keyword, line)
+                    pos = scan
+
+                elif keyword == 'parameter':
+                    scan = pos + 1
+                    while scan < count and types[scan] != _IDENTIFIER_ID:
+                        scan += 1
+                    if scan < count:
+                        param_name = values[scan]
+                        if 'parameter' in callbacks:
+                            callbacks['parameter'](param_name, lines[scan])
+                        self.current_parameters.append({
+                            'name': param_name,
+                            'line': lines[scan]
+                        })
+                        if 'parameter_declaration' in callbacks:
+                            callbacks['parameter_declaration'](param_name,
+                                                               lines[scan])
+                    pos = scan
+
+                elif keyword == 'endmodule':
+                    if 'module_end' in callbacks:
+                        callbacks['module_end']()
+
+                elif keyword == 'always':
+                    if 'always_begin' in callbacks:
+                        callbacks['always_begin'](line)
+
+                elif keyword == 'assign':
+                    if 'assign' in callbacks:
+                        callbacks['assign'](line)
+
+            elif type_id == _DIRECTIVE_ID:
+                if 'directive' in callbacks:
+                    callbacks['directive'](values[pos][1:], lines[pos],
+                                           columns[pos])
+
+            elif type_id == _IDENTIFIER_ID:
+                if 'identifier' in callbacks:
+                    callbacks['identifier'](values[pos], lines[pos],
+                                            columns[pos])
+
+            pos += 1
+
+        self.current_token = pos
+
+    def _parse_module(self) -> Optional[int]:
+        """Parse module declaration with signal tracking"""
+        index = super()._parse_module()
+
+        # Reset module state
+        self.current_module = None
+        self.current_ports = []
+        self.current_nets = []
+        self.current_parameters = []
+
+        # Reuse the name index the base class found rather than re-scanning
+        if index is None:
+            index = self._advance_to_identifier()
+        if index is not None:
+            self.current_module = self.tokens.values[index]
+        return index
+
+    def _parse_port_declaration(self, token: Token) -> Optional[int]:
+        """Parse port declaration with signal tracking"""
+        index = super()._parse_port_declaration(token)
+        if index is None:
+            index = self._advance_to_identifier()
+        if index is None:
+            return None
+
+        direction = token.value.lower()
+        port_name = self.tokens.values[index]
+        self.current_ports.append({
+            'name': port_name,
+            'direction': direction,
+            'line': token.line
+        })
+
+        if 'signal_declaration' in self.callbacks:
+            self.callbacks['signal_declaration']('port', port_name, direction, token.line)
+        return index
+
+    def _parse_net_declaration(self, token: Token) -> Optional[int]:
+        """Parse net declaration with signal tracking"""
+        index = super()._parse_net_declaration(token)
+        if index is None:
+            index = self._advance_to_identifier()
+        if index is None:
+            return None
+
+        net_type = token.value.lower()
+        net_name = self.tokens.values[index]
+        self.current_nets.append({
+            'name': net_name,
+            'type': net_type,
+            'line': token.line
+        })
+
+        if 'signal_declaration' in self.callbacks:
+            self.callbacks['signal_declaration']('net', net_name, net_type, token.line)
+        return index
+
+    def _parse_parameter(self) -> Optional[int]:
+        """Parse parameter declaration with signal tracking"""
+        index = super()._parse_parameter()
+        if index is None:
+            index = self._advance_to_identifier()
+        if index is None:
+            return None
+
+        stream = self.tokens
+        param_name = stream.values[index]
+        param_line = stream.lines[index]
+        self.current_parameters.append({
+            'name': param_name,
+            'line': param_line
+        })
+
+        if 'parameter_declaration' in self.callbacks:
+            self.callbacks['parameter_declaration'](param_name, param_line)
+        return index
+    
+    def get_module_info(self) -> Dict[str, Any]:
+        """Get information about the current module"""
+        return {
+            'name': self.current_module,
+            'ports': self.current_ports,
+            'nets': self.current_nets,
+            'parameters': self.current_parameters
         } 
\ No newline at end of file
@@ -1,280 +1,447 @@
-"""
-Verilog::Preproc - Verilog preprocessor
-
-This module reads Verilog files and preprocesses them according to
-the Verilog specification, handling includes, defines, and other
-preprocessor directives.
-"""
-
-import os
-import re
-import sys
-from typing import List, Dict, Optional, TextIO, Iterator
-from pathlib import Path
-
-
-class Preproc:
-    """Verilog preprocessor class"""
-    
-    def __init__(self, defines: Optional[Dict[str, str]] = None, 
-                 include_paths: Optional[List[str]] = None):
-        """Initialize preprocessor with defines and include paths"""
-        self.defines = defines or {}
-        self.include_paths = include_paths or []
-        self.include_stack = []  # Track included files
-        self.line_directives = []  # Track line directives
-        self.conditional_stack = []  # Track ifdef/ifndef nesting
-        
-        # Preprocessor directive patterns
-        self.directives = {
-            'define': self._handle_define,
-            'undef': self._handle_undef,
-            'include': self._handle_include,
-            'ifdef': self._handle_ifdef,
-            'ifndef': self._handle_ifndef,
-            'else': self._handle_else,
-            'elsif': self._handle_elsif,
-            'endif': self._handle_endif,
-            'timescale': self._handle_timescale,
-            'line': self._handle_line,
-            'pragma': self._handle_pragma,
-            'begin_keywords': self._handle_begin_keywords,
-            'end_keywords': self._handle_end_keywords,
-        }
-    
-    def preprocess_file(self, filename: str) -> str:
-        """Preprocess a Verilog file and return the processed content"""
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                return self.preprocess_stream(f, filename)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"File not found: {filename}")
-    
-    def preprocess_stream(self, stream: TextIO, filename: str = "<stream>") -> str:
-        """Preprocess a file stream and return the processed content"""
-        self.include_stack.append(filename)
-        result = []
-        
-        try:
-            for line_num, line in enumerate(stream, 1):
-                processed_line = self._process_line(line, line_num, filename)
-                if processed_line is not None:
-                    result.append(processed_line)
-        finally:
-            self.include_stack.pop()
-        
-        return ''.join(result)
-    
-    def _process_line(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Process a single line of Verilog code"""
-        # Handle line continuation
-        if line.rstrip().endswith('\\'):
-            # This is a continuation line
-            return line.rstrip()[:-1] + ' '
-        
-        # Check for preprocessor directives
-        directive_match = re.match(r'^\s*`(\w+)', line)
-        if directive_match:
-            directive = directive_match.group(1)
-            if directive in self.directives:
-                return self.directives[directive](line, line_num, filename)
-            else:
-                # Unknown directive, pass through
-                return line
-        
-        # Check if we're in a conditional block that should be excluded
-        if self.conditional_stack and not self.conditional_stack[-1]['active']:
-            return None
-        
-        # Handle defines in the line
-        return self._expand_defines(line)
-    
-    def _handle_define(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `define directive"""
-        # Skip if in inactive conditional block
-        if self.conditional_stack and not self.conditional_stack[-1]['active']:
-            return None
-        
-        # Parse define: `define name value
-        match = re.match(r'^\s*`define\s+(\w+)(?:\s+(.+))?$', line)
-        if match:
-            name = match.group(1)
-            value = match.group(2) or ''
-            self.defines[name] = value.strip()
-        
-        return None  # Don't include define lines in output
-    
-    def _handle_undef(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `undef directive"""
-        if self.conditional_stack and not self.conditional_stack[-1]['active']:
-            return None
-        
-        match = re.match(r'^\s*`undef\s+(\w+)', line)
-        if match:
-            name = match.group(1)
-            if name in self.defines:
-                del self.defines[name]
-        
-        return None
-    
-    def _handle_include(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `include directive"""
-        if self.conditional_stack and not self.conditional_stack[-1]['active']:
-            return None
-        
-        # Parse include: `include "filename" or `include <filename>
-        match = re.match(r'^\s*`include\s+["<]([^">]+)[">]', line)
-        if match:
-            include_file = match.group(1)
-            resolved_file = self._resolve_include(include_file, filename)
-            if resolved_file:
-                try:
-                    with open(resolved_file, 'r', encoding='utf-8') as f:
-                        included_content = self.preprocess_stream(f, resolved_file)
-                        return included_content
-                except FileNotFoundError:
-                    print(f"Warning: Include file not found: {include_file}", 
-                          file=sys.stderr)
-        
-        return None
-    
-    def _handle_ifdef(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `ifdef directive"""
-        match = re.match(r'^\s*`ifdef\s+(\w+)', line)
-        if match:
-            name = match.group(1)
-            active = name in self.defines
-            self.conditional_stack.append({
-                'type': 'ifdef',
-                'active': active,
-                'had_else': False
-            })
-        
-        return None
-    
-    def _handle_ifndef(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `ifndef directive"""
-        match = re.match(r'^\s*`ifndef\s+(\w+)', line)
-        if match:
-            name = match.group(1)
-            active = name not in self.defines
-            self.conditional_stack.append({
-                'type': 'ifndef',
-                'active': active,
-                'had_else': False
-            })
-        
-        return None
-    
-    def _handle_else(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `else directive"""
-        if not self.conditional_stack:
-            print(f"Warning: `else without matching `ifdef/`ifndef", file=sys.stderr)
-            return None
-        
-        current = self.conditional_stack[-1]
-        if current['had_else']:
-            print(f"Warning: Multiple `else in conditional block", file=sys.stderr)
-            return None
-        
-        current['active'] = not current['active']
-        current['had_else'] = True
-        
-        return None
-    
-    def _handle_elsif(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `elsif directive"""
-        if not self.conditional_stack:
-            print(f"Warning: `elsif without matching `ifdef/`ifndef", file=sys.stderr)
-            return None
-        
-        current = self.conditional_stack[-1]
-        if current['had_else']:
-            print(f"Warning: `elsif after `else", file=sys.stderr)
-            return None
-        
-        match = re.match(r'^\s*`elsif\s+(\w+)', line)
-        if match:
-            name = match.group(1)
-            # Only active if previous conditions were false and this one is true
-            current['active'] = not current.get('previous_active', False) and name in self.defines
-            current['previous_active'] = current['active']
-        
-        return None
-    
-    def _handle_endif(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `endif directive"""
-        if not self.conditional_stack:
-            print(f"Warning: `endif without matching `ifdef/`ifndef", file=sys.stderr)
-            return None
-        
-        self.conditional_stack.pop()
-        return None
-    
-    def _handle_timescale(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `timescale directive"""
-        # Pass through timescale directives
-        return line
-    
-    def _handle_line(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `line directive"""
-        # Pass through line directives
-        return line
-    
-    def _handle_pragma(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `pragma directive"""
-        # Pass through pragma directives
-        return line
-    
-    def _handle_begin_keywords(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `begin_keywords directive"""
-        # Pass through keywords directives
-        return line
-    
-    def _handle_end_keywords(self, line: str, line_num: int, filename: str) -> Optional[str]:
-        """Handle `end_keywords directive"""
-        # Pass through keywords directives
-        return line
-    
-    def _resolve_include(self, include_file: str, current_file: str) -> Optional[str]:
-        """Resolve an include file path"""
-        # First check if it's an absolute path
-        if os.path.isabs(include_file):
-            return include_file if os.path.exists(include_file) else None
-        
-        # Check relative to current file
-        current_dir = os.path.dirname(current_file)
-        relative_path = os.path.join(current_dir, include_file)
-        if os.path.exists(relative_path):
-            return relative_path
-        
-        # Check include paths
-        for include_path in self.include_paths:
-            full_path = os.path.join(include_path, include_file)
-            if os.path.exists(full_path):
-                return full_path
-        
-        return None
-    
-    def _expand_defines(self, line: str) -> str:
-        """Expand defines in a line of text"""
-        # Simple define expansion - this could be made more sophisticated
-        for name, value in self.defines.items():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(name) + r'\b'
-            line = re.sub(pattern, value, line)
-        
-        return line
-    
-    def get_defines(self) -> Dict[str, str]:
-        """Get current defines dictionary"""
-        return self.defines.copy()
-    
-    def add_define(self, name: str, value: str = '1') -> None:
-        """Add a define"""
-        self.defines[name] = value
-    
-    def remove_define(self, name: str) -> None:
-        """Remove a define"""
-        if name in self.defines:
-            del self.defines[name] 
\ No newline at end of file
+"""
+Verilog::Preproc - Verilog preprocessor
+
+This module reads Verilog files and preprocesses them according to
+the Verilog specification, handling includes, defines, and other
+preprocessor directives.
+"""
+
+import mmap
+import os
+import re
+import sys
+from types import MappingProxyType
+from typing import List, Dict, Optional, TextIO, Iterator
+from pathlib import Path
+
+
+class _CondFrame:
+    """One level of `ifdef/`ifndef nesting"""
+
+    __slots__ = ('type', 'active', 'had_else', 'had_true')
+
+    def __init__(self, frame_type: str, active: bool):
+        self.type = frame_type
+        self.active = active
+        self.had_else = False
+        self.had_true = active  # Some branch of this chain has matched
+
+
+class Preproc:
+    """Verilog preprocessor class"""
+
+    # Directive patterns, compiled once at class definition; the
+    # re.match(str, ...) form pays a cache lookup per line
+    _RE_DIRECTIVE = re.compile(r'^\s*`(\w+)')
+    _RE_DEFINE = re.compile(r'^\s*`define\s+(\w+)(?:\s+(.+))?$')
+    _RE_UNDEF = re.compile(r'^\s*`undef\s+(\w+)')
+    _RE_INCLUDE = re.compile(r'^\s*`include\s+["<]([^">]+)[">]')
+    _RE_IFDEF = re.compile(r'^\s*`ifdef\s+(\w+)')
+    _RE_IFNDEF = re.compile(r'^\s*`ifndef\s+(\w+)')
+    _RE_ELSIF = re.compile(r'^\s*`elsif\s+(\w+)')
+
+    def __init__(self, defines: Optional[Dict[str, str]] = None, 
+                 include_paths: Optional[List[str]] = None):
+        """Initialize preprocessor with defines and include paths"""
+        self.defines = defines or {}
+        self.include_paths = include_paths or []
+        self.include_stack = []  # Track included files
+        self.included_files = set()  # Resolved path of every include read
+        self.line_directives = []  # Track line directives
+        self.conditional_stack = []  # Track ifdef/ifndef nesting
+        self._defines_re = None  # Compiled alternation of define names
+        self._defines_dirty = True  # Rebuild _defines_re on next expansion
+        self._defines_names = frozenset()  # Names _defines_re was built from
+        self._include_cache = {}  # (include file, including dir) -> path
+        self._dir_names = {}  # include dir -> frozenset of entry names
+        self._canonical_cache = {}  # candidate path -> normalized path
+        self._file_text_cache = {}  # (path, mtime_ns) -> file text
+    
+    def preprocess_file(self, filename: str) -> str:
+        """Preprocess a Verilog file and return the processed content"""
+        # Map the file and decode it once in bulk instead of paying the
+        # text-mode per-line decode during iteration
+        try:
+            with open(filename, 'rb') as f:
+                try:
+                    with mmap.mmap(f.fileno(), 0,
+                                   access=mmap.ACCESS_READ) as mapped:
+                        data = bytes(mapped)
+                except ValueError:
+                    # Empty files cannot be mapped
+                    data = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {filename}")
+        return self.preprocess_text(data.decode('utf-8'), filename)
+
+    def preprocess_stream(self, stream: TextIO, filename: str = "<stream>") -> str:
+        """Preprocess a file stream and return the processed content"""
+        return self.preprocess_text(stream.read(), filename)
+
+    def preprocess_text(self, text: str, filename: str = "<text>") -> str:
+        """Preprocess already-loaded Verilog text and return the result"""
+        return ''.join(self.preprocess_iter(text, filename))
+
+    def preprocess_iter(self, text: str,
+                        filename: str = "<text>") -> Iterator[str]:
+        """Preprocess Verilog text, yielding output lines as they emerge
+
+        Streaming keeps the working set bounded for callers that write
+        to a sink; preprocess_text is a join over this generator.
+        """
+        self.include_stack.append(filename)
+        stack = self.conditional_stack
+        defines = self.defines
+
+        try:
+            for line_num, line in enumerate(text.splitlines(keepends=True), 1):
+                # Fast path: a line without a backtick cannot be a directive
+                # and one without a backslash cannot be a continuation, so
+                # only the conditional state and define expansion apply.
+                # The containment tests are C-level substring scans.
+                if '`' not in line and '\\' not in line:
+                    if stack and not stack[-1].active:
+                        continue
+                    yield self._expand_defines(line) if defines else line
+                    continue
+                processed_line = self._process_line(line, line_num, filename)
+                if processed_line is not None:
+                    yield processed_line
+        finally:
+            self.include_stack.pop()
+    
+    def _process_line(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Process a single line of Verilog code"""
+        # Handle line continuation
+        if line.rstrip().endswith('\\'):
+            # This is a continuation line
+            return line.rstrip()[:-1] + ' '
+        
+        # Check for preprocessor directives
+        directive_match = self._RE_DIRECTIVE.match(line)
+        if directive_match:
+            handler = self._DIRECTIVE_TABLE.get(directive_match.group(1))
+            if handler is not None:
+                return handler(self, line, line_num, filename)
+            # Unknown directive, pass through
+            return line
+        
+        # Check if we're in a conditional block that should be excluded
+        if self.conditional_stack and not self.conditional_stack[-1].active:
+            return None
+        
+        # Handle defines in the line
+        return self._expand_defines(line)
+    
+    def _handle_define(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `define directive"""
+        # Skip if in inactive conditional block
+        if self.conditional_stack and not self.conditional_stack[-1].active:
+            return None
+        
+        # Parse define: `define name value
+        match = self._RE_DEFINE.match(line)
+        if match:
+            name = match.group(1)
+            value = match.group(2) or ''
+            self.defines[name] = value.strip()
+            self._defines_dirty = True
+
+        return None  # Don't include define lines in output
+    
+    def _handle_undef(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `undef directive"""
+        if self.conditional_stack and not self.conditional_stack[-1].active:
+            return None
+        
+        match = self._RE_UNDEF.match(line)
+        if match:
+            name = match.group(1)
+            if name in self.defines:
+                del self.defines[name]
+                self._defines_dirty = True
+
+        return None
+    
+    def _handle_include(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `include directive"""
+        if self.conditional_stack and not self.conditional_stack[-1].active:
+            return None
+        
+        # Parse include: `include "filename" or `include <filename>
+        match = self._RE_INCLUDE.match(line)
+        if match:
+            include_file = match.group(1)
+            resolved_file = self._resolve_include(include_file, filename)
+            if resolved_file:
+                try:
+                    text = self._read_include_text(resolved_file)
+                except FileNotFoundError:
+                    print(f"Warning: Include file not found: {include_file}",
+                          file=sys.stderr)
+                else:
+                    self.included_files.add(resolved_file)
+                    # The text is cached, but it is re-expanded here since
+                    # the defines in force may differ per inclusion site
+                    return self.preprocess_text(text, resolved_file)
+
+        return None
+
+    def _read_include_text(self, path: str) -> str:
+        """Read an include file's text, cached by path and mtime
+
+        Shared headers are included from many files; caching the raw
+        text avoids re-reading them from disk on every inclusion while
+        the mtime key keeps edits visible.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            raise FileNotFoundError(path)
+        cache_key = (path, mtime)
+        text = self._file_text_cache.get(cache_key)
+        if text is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            self._file_text_cache[cache_key] = text
+        return text
+    
+    def _handle_ifdef(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `ifdef directive"""
+        if self._push_inert_if_skipped('ifdef'):
+            return None
+        match = self._RE_IFDEF.match(line)
+        if match:
+            name = match.group(1)
+            active = name in self.defines
+            self.conditional_stack.append(_CondFrame('ifdef', active))
+
+        return None
+
+    def _handle_ifndef(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `ifndef directive"""
+        if self._push_inert_if_skipped('ifndef'):
+            return None
+        match = self._RE_IFNDEF.match(line)
+        if match:
+            name = match.group(1)
+            active = name not in self.defines
+            self.conditional_stack.append(_CondFrame('ifndef', active))
+
+        return None
+
+    def _push_inert_if_skipped(self, frame_type: str) -> bool:
+        """Push an inert frame when the enclosing branch is inactive
+
+        Inside a skipped branch the identifier is never evaluated; the
+        frame is pushed with had_true set so `else/`elsif cannot
+        activate it either.  Returns True if the inert frame was pushed.
+        """
+        stack = self.conditional_stack
+        if stack and not stack[-1].active:
+            frame = _CondFrame(frame_type, False)
+            frame.had_true = True
+            stack.append(frame)
+            return True
+        return False
+    
+    def _handle_else(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `else directive"""
+        if not self.conditional_stack:
+            print(f"Warning: `else without matching `ifdef/`ifndef", file=sys.stderr)
+            return None
+        
+        current = self.conditional_stack[-1]
+        if current.had_else:
+            print(f"Warning: Multiple `else in conditional block", file=sys.stderr)
+            return None
+        
+        current.active = not current.had_true
+        current.had_true = True
+        current.had_else = True
+        
+        return None
+    
+    def _handle_elsif(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `elsif directive"""
+        if not self.conditional_stack:
+            print(f"Warning: `elsif without matching `ifdef/`ifndef", file=sys.stderr)
+            return None
+        
+        current = self.conditional_stack[-1]
+        if current.had_else:
+            print(f"Warning: `elsif after `else", file=sys.stderr)
+            return None
+        
+        # Once a branch has matched, later `elsif conditions need not be
+        # evaluated at all
+        if current.had_true:
+            current.active = False
+            return None
+
+        match = self._RE_ELSIF.match(line)
+        if match:
+            name = match.group(1)
+            current.active = name in self.defines
+            current.had_true = current.active
+
+        return None
+    
+    def _handle_endif(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `endif directive"""
+        if not self.conditional_stack:
+            print(f"Warning: `endif without matching `ifdef/`ifndef", file=sys.stderr)
+            return None
+        
+        self.conditional_stack.pop()
+        return None
+    
+    def _handle_timescale(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `timescale directive"""
+        # Pass through timescale directives
+        return line
+    
+    def _handle_line(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `line directive"""
+        # Pass through line directives
+        return line
+    
+    def _handle_pragma(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `pragma directive"""
+        # Pass through pragma directives
+        return line
+    
+    def _handle_begin_keywords(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `begin_keywords directive"""
+        # Pass through keywords directives
+        return line
+    
+    def _handle_end_keywords(self, line: str, line_num: int, filename: str) -> Optional[str]:
+        """Handle `end_keywords directive"""
+        # Pass through keywords directives
+        return line
+
+    # Directive dispatch table, built once at class definition and shared
+    # by all instances
+    _DIRECTIVE_TABLE = {
+        'define': _handle_define,
+        'undef': _handle_undef,
+        'include': _handle_include,
+        'ifdef': _handle_ifdef,
+        'ifndef': _handle_ifndef,
+        'else': _handle_else,
+        'elsif': _handle_elsif,
+        'endif': _handle_endif,
+        'timescale': _handle_timescale,
+        'line': _handle_line,
+        'pragma': _handle_pragma,
+        'begin_keywords': _handle_begin_keywords,
+        'end_keywords': _handle_end_keywords,
+    }
+
+    def _resolve_include(self, include_file: str, current_file: str) -> Optional[str]:
+        """Resolve an include file path"""
+        # Shared headers are re-included from many files; cache the search
+        # result so each repeated lookup is a dict hit instead of a walk
+        # over include_paths with a stat per candidate
+        current_dir = os.path.dirname(current_file)
+        cache_key = (include_file, current_dir)
+        try:
+            return self._include_cache[cache_key]
+        except KeyError:
+            pass
+
+        resolved = self._search_include(include_file, current_dir)
+        self._include_cache[cache_key] = resolved
+        return resolved
+
+    def _search_include(self, include_file: str, current_dir: str) -> Optional[str]:
+        """Search the filesystem for an include file"""
+        # First check if it's an absolute path
+        if os.path.isabs(include_file):
+            if os.path.exists(include_file):
+                return self._canonicalize(include_file)
+            return None
+
+        # Check relative to current file
+        relative_path = os.path.join(current_dir, include_file)
+        if os.path.exists(relative_path):
+            return self._canonicalize(relative_path)
+
+        # Check include paths; for plain names one scandir listing per
+        # directory replaces a stat per miss, which dominates when many
+        # include dirs are searched (worst on networked filesystems)
+        simple_name = '/' not in include_file and os.sep not in include_file
+        for include_path in self.include_paths:
+            if simple_name and include_file not in self._dir_entries(include_path):
+                continue
+            full_path = os.path.join(include_path, include_file)
+            if os.path.exists(full_path):
+                return self._canonicalize(full_path)
+
+        return None
+
+    def _dir_entries(self, directory: str) -> frozenset:
+        """Entry names of an include directory, listed once via scandir"""
+        try:
+            return self._dir_names[directory]
+        except KeyError:
+            try:
+                with os.scandir(directory) as entries:
+                    names = frozenset(entry.name for entry in entries)
+            except OSError:
+                names = frozenset()
+            self._dir_names[directory] = names
+            return names
+
+    def _canonicalize(self, path: str) -> str:
+        """Normalize a resolved path, caching per unique spelling
+
+        Spellings like dir/../foo/bar.vh and foo/bar.vh collapse to one
+        canonical form, so downstream caches keyed on the resolved path
+        dedupe across the different ways a header is referenced.
+        """
+        canonical = self._canonical_cache.get(path)
+        if canonical is None:
+            canonical = os.path.normpath(path)
+            self._canonical_cache[path] = canonical
+        return canonical
+
+    def add_include_path(self, path: str) -> None:
+        """Add a directory to the include search path"""
+        self.include_paths.append(path)
+        self._include_cache.clear()
+    
+    def _expand_defines(self, line: str) -> str:
+        """Expand defines in a line of text"""
+        defines = self.defines
+        if not defines:
+            return line
+
+        # One word-bounded alternation over all define names, rebuilt only
+        # when the define set changes, replaces the per-define sub passes.
+        # defines is a public dict callers mutate directly, so the name
+        # snapshot catches changes the dirty flag never sees.
+        if self._defines_dirty or defines.keys() != self._defines_names:
+            names = sorted(defines, key=len, reverse=True)
+            self._defines_re = re.compile(
+                r'\b(' + '|'.join(map(re.escape, names)) + r')\b')
+            self._defines_names = frozenset(names)
+            self._defines_dirty = False
+
+        return self._defines_re.sub(lambda m: defines[m.group(1)], line)
+    
+    def get_defines(self) -> Dict[str, str]:
+        """Get a read-only view of the current defines"""
+        return MappingProxyType(self.defines)
+    
+    def add_define(self, name: str, value: str = '1') -> None:
+        """Add a define"""
+        self.defines[name] = value
+        self._defines_dirty = True
+
+    def remove_define(self, name: str) -> None:
+        """Remove a define"""
+        if name in self.defines:
+            del self.defines[name]
+            self._defines_dirty = True 
\ No newline at end of file
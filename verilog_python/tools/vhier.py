@@ -1,189 +1,392 @@
-#!/usr/bin/env python3
-"""
-vhier - Verilog hierarchy display tool
-
-This tool reads Verilog files and outputs a tree of all filenames,
-modules, and cells referenced by those files.
-"""
-
-import sys
-import argparse
-from pathlib import Path
-
-# Add the parent directory to the path so we can import verilog_python
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
-from verilog_python import Netlist, Getopt, Language
-
-
-def main():
-    """Main function for vhier tool"""
-    parser = argparse.ArgumentParser(
-        description="Display Verilog design hierarchy",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  vhier design.v
-  vhier --cells design.v
-  vhier --modules design.v
-  vhier --forest design.v
-        """
-    )
-    
-    parser.add_argument('files', nargs='+', help='Verilog files to analyze')
-    parser.add_argument('--cells', action='store_true', help='Show cell hierarchy')
-    parser.add_argument('--modules', action='store_true', help='Show module names')
-    parser.add_argument('--module-files', action='store_true', help='Show module file mapping')
-    parser.add_argument('--includes', action='store_true', help='Show include files')
-    parser.add_argument('--input-files', action='store_true', help='Show input files')
-    parser.add_argument('--resolve-files', action='store_true', help='Show resolved filenames')
-    parser.add_argument('--missing', action='store_true', default=True, help='Show missing modules')
-    parser.add_argument('--missing-modules', action='store_true', help='Show missing module details')
-    parser.add_argument('--top-module', help='Specify top module')
-    parser.add_argument('--synthesis', action='store_true', help='Synthesis mode')
-    parser.add_argument('--forest', action='store_true', help='Show hierarchy forest')
-    parser.add_argument('--instance', action='store_true', help='Show instance names')
-    parser.add_argument('--xml', action='store_true', help='Output in XML format')
-    parser.add_argument('--language', help='Language standard (1364-1995, 1364-2001, etc.)')
-    parser.add_argument('--sv', action='store_true', help='SystemVerilog mode')
-    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
-    parser.add_argument('--debug', action='store_true', help='Enable debug output')
-    parser.add_argument('--version', action='version', version='vhier 1.0.0')
-    
-    args = parser.parse_args()
-    
-    # Set language standard
-    if args.sv:
-        Language.language_standard('1800-2023')
-    elif args.language:
-        Language.language_standard(args.language)
-    
-    # Create netlist
-    netlist = Netlist()
-    
-    # Read files
-    for filename in args.files:
-        if args.debug:
-            print(f"Reading {filename}", file=sys.stderr)
-        try:
-            netlist.read_file(filename)
-        except Exception as e:
-            print(f"Error reading {filename}: {e}", file=sys.stderr)
-    
-    # Link the design
-    netlist.link()
-    
-    # Output handling
-    output_file = sys.stdout
-    if args.output:
-        try:
-            output_file = open(args.output, 'w')
-        except Exception as e:
-            print(f"Error opening output file: {e}", file=sys.stderr)
-            sys.exit(1)
-    
-    try:
-        if args.xml:
-            output_file.write("<vhier>\n")
-        
-        # Show cells hierarchy
-        if args.cells or args.forest:
-            if args.xml:
-                output_file.write(" <cells>\n")
-            else:
-                output_file.write("Cell Hierarchy:\n")
-                output_file.write("===============\n")
-            
-            for module in netlist.get_top_modules():
-                show_hierarchy(output_file, module, "", args.instance, args.xml)
-            
-            if args.xml:
-                output_file.write(" </cells>\n")
-        
-        # Show module names
-        if args.modules:
-            if args.xml:
-                output_file.write(" <modules>\n")
-            else:
-                output_file.write("\nModule Names:\n")
-                output_file.write("=============\n")
-            
-            for module in netlist.get_modules():
-                if args.xml:
-                    output_file.write(f"  <module>{module.name}</module>\n")
-                else:
-                    output_file.write(f"  {module.name}\n")
-            
-            if args.xml:
-                output_file.write(" </modules>\n")
-        
-        # Show module file mapping
-        if args.module_files:
-            if args.xml:
-                output_file.write(" <module_files>\n")
-            else:
-                output_file.write("\nModule File Mapping:\n")
-                output_file.write("===================\n")
-            
-            for module in netlist.get_modules():
-                filename = module.filename or "unknown"
-                if args.xml:
-                    output_file.write(f"  <module_file module=\"{module.name}\" file=\"{filename}\"/>\n")
-                else:
-                    output_file.write(f"  {module.name}: {filename}\n")
-            
-            if args.xml:
-                output_file.write(" </module_files>\n")
-        
-        # Show input files
-        if args.input_files:
-            if args.xml:
-                output_file.write(" <input_files>\n")
-            else:
-                output_file.write("\nInput Files:\n")
-                output_file.write("============\n")
-            
-            for filename in args.files:
-                if args.xml:
-                    output_file.write(f"  <file>{filename}</file>\n")
-                else:
-                    output_file.write(f"  {filename}\n")
-            
-            if args.xml:
-                output_file.write(" </input_files>\n")
-        
-        if args.xml:
-            output_file.write("</vhier>\n")
-    
-    finally:
-        if args.output and output_file != sys.stdout:
-            output_file.close()
-
-
-def show_hierarchy(output_file, module, indent="", show_instance=False, xml=False):
-    """Show hierarchy for a module"""
-    if xml:
-        output_file.write(f"{indent}<module name=\"{module.name}\">\n")
-    else:
-        instance_info = f" ({module.name})" if show_instance else ""
-        output_file.write(f"{indent}{module.name}{instance_info}\n")
-    
-    # Show cells
-    for cell_name, cell in module.cells.items():
-        if xml:
-            output_file.write(f"{indent}  <cell name=\"{cell_name}\" module=\"{cell.module_name}\">\n")
-            if cell.module:
-                show_hierarchy(output_file, cell.module, indent + "    ", show_instance, xml)
-            output_file.write(f"{indent}  </cell>\n")
-        else:
-            cell_info = f" ({cell.module_name})" if show_instance else ""
-            output_file.write(f"{indent}  {cell_name}{cell_info}\n")
-            if cell.module:
-                show_hierarchy(output_file, cell.module, indent + "    ", show_instance, xml)
-    
-    if xml:
-        output_file.write(f"{indent}</module>\n")
-
-
-if __name__ == '__main__':
+#!/usr/bin/env python3
+"""
+vhier - Verilog hierarchy display tool
+
+This tool reads Verilog files and outputs a tree of all filenames,
+modules, and cells referenced by those files.
+"""
+
+import sys
+import argparse
+import hashlib
+import os
+import pickle
+import textwrap
+from pathlib import Path
+
+# Source-tree fallback: when running the script directly the package
+# is not installed, so put the repo root on the path. Installed entry
+# points import through the package and skip this.
+if 'verilog_python' not in sys.modules:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Escape table for XML attribute values and text, applied via
+# str.translate which runs the whole scan in C
+_XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;',
+                             '"': '&quot;', '\n': '&#10;'})
+
+
+# Defaults mirrored from _build_parser for the no-flag fast path;
+# keep in sync when adding options
+_ARG_DEFAULTS = dict(
+    cells=False, modules=False, module_files=False, includes=False,
+    input_files=False, resolve_files=False, missing=True,
+    missing_modules=False, top_module=None, synthesis=False, forest=False,
+    instance=False, xml=False, language=None, sv=False, output=None,
+    no_cache=False, debug=False)
+
+
+def _parse_args():
+    """Parse argv, skipping argparse construction when no flags are given"""
+    argv = sys.argv[1:]
+    if argv and all(not arg.startswith('-') for arg in argv):
+        return argparse.Namespace(files=argv, **_ARG_DEFAULTS)
+    return _build_parser().parse_args()
+
+
+def _build_parser():
+    """Build the full argument parser (slow path)"""
+    parser = argparse.ArgumentParser(
+        description="Display Verilog design hierarchy",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  vhier design.v
+  vhier --cells design.v
+  vhier --modules design.v
+  vhier --forest design.v
+        """
+    )
+    
+    parser.add_argument('files', nargs='+', help='Verilog files to analyze')
+    parser.add_argument('--cells', action='store_true', help='Show cell hierarchy')
+    parser.add_argument('--modules', action='store_true', help='Show module names')
+    parser.add_argument('--module-files', action='store_true', help='Show module file mapping')
+    parser.add_argument('--includes', action='store_true', help='Show include files')
+    parser.add_argument('--input-files', action='store_true', help='Show input files')
+    parser.add_argument('--resolve-files', action='store_true', help='Show resolved filenames')
+    parser.add_argument('--missing', action='store_true', default=True, help='Show missing modules')
+    parser.add_argument('--missing-modules', action='store_true', help='Show missing module details')
+    parser.add_argument('--top-module', help='Specify top module')
+    parser.add_argument('--synthesis', action='store_true', help='Synthesis mode')
+    parser.add_argument('--forest', action='store_true', help='Show hierarchy forest')
+    parser.add_argument('--instance', action='store_true', help='Show instance names')
+    parser.add_argument('--xml', action='store_true', help='Output in XML format')
+    parser.add_argument('--language', help='Language standard (1364-1995, 1364-2001, etc.)')
+    parser.add_argument('--sv', action='store_true', help='SystemVerilog mode')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not reuse or store the link result cache')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--version', action='version', version='vhier 1.0.0')
+    return parser
+
+
+def main():
+    """Main function for vhier tool"""
+    args = _parse_args()
+
+    # Imported here so --help and --version skip the package import
+    from verilog_python import Netlist, Language
+
+    # Set language standard
+    if args.sv:
+        Language.language_standard('1800-2023')
+    elif args.language:
+        Language.language_standard(args.language)
+    
+    # Create netlist
+    netlist = Netlist()
+
+    # Reuse a previously linked design when the inputs are unchanged;
+    # re-runs with different display flags then skip parse and link
+    cache_path = None if args.no_cache else _link_cache_path(args.files)
+    loaded = False
+    if cache_path is not None and cache_path.exists():
+        try:
+            include_stamps, modules, refcounts = pickle.loads(
+                cache_path.read_bytes())
+        except Exception:
+            pass  # stale or corrupt cache entry; reparse below
+        else:
+            # The key only covers the input files; included headers are
+            # stamped in the entry and re-checked here
+            if _stamps_current(include_stamps):
+                netlist.modules = modules
+                netlist._inst_refcount = refcounts
+                for module in modules.values():
+                    module.parent_netlist = netlist
+                loaded = True
+                if args.debug:
+                    print("Using cached link result", file=sys.stderr)
+
+    if not loaded:
+        # Read files; multi-file designs parse in parallel processes
+        # and merge serially before the single link pass
+        if len(args.files) > 1:
+            if args.debug:
+                print(f"Reading {len(args.files)} files in parallel",
+                      file=sys.stderr)
+            netlist.read_files(args.files)
+        else:
+            for filename in args.files:
+                if args.debug:
+                    print(f"Reading {filename}", file=sys.stderr)
+                try:
+                    netlist.read_file(filename)
+                except Exception as e:
+                    print(f"Error reading {filename}: {e}", file=sys.stderr)
+
+        # Link the design
+        netlist.link()
+
+        if cache_path is not None:
+            try:
+                include_stamps = _stamp_files(netlist.preproc.included_files)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write-then-rename so a concurrent run never reads a
+                # partially written entry
+                tmp_path = cache_path.with_name(
+                    f"{cache_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(pickle.dumps(
+                    (include_stamps, netlist.modules,
+                     netlist._inst_refcount),
+                    pickle.HIGHEST_PROTOCOL))
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                pass  # caching is best-effort
+    
+    # All output is accumulated and written once at the end; stdout
+    # takes the binary path so the joined text is encoded in one pass
+    # instead of per-write through the TextIOWrapper
+    out = []
+
+    if args.xml:
+        out.append("<vhier>\n")
+
+    # Show cells hierarchy
+    if args.cells or args.forest:
+        if args.xml:
+            out.append(" <cells>\n")
+        else:
+            out.append("Cell Hierarchy:\n")
+            out.append("===============\n")
+
+        render_cache = {}
+        for module in netlist.get_top_modules():
+            show_hierarchy(out, module, "", args.instance, args.xml,
+                           render_cache)
+
+        if args.xml:
+            out.append(" </cells>\n")
+
+    # Both module listings walk the same registry; fetch it once
+    modules = (netlist.get_modules()
+               if (args.modules or args.module_files) else None)
+
+    # Show module names
+    if args.modules:
+        if args.xml:
+            out.append(" <modules>\n")
+        else:
+            out.append("\nModule Names:\n")
+            out.append("=============\n")
+
+        for module in modules:
+            if args.xml:
+                out.append(f"  <module>{module.name.translate(_XML_ESCAPE)}</module>\n")
+            else:
+                out.append(f"  {module.name}\n")
+
+        if args.xml:
+            out.append(" </modules>\n")
+
+    # Show module file mapping
+    if args.module_files:
+        if args.xml:
+            out.append(" <module_files>\n")
+        else:
+            out.append("\nModule File Mapping:\n")
+            out.append("===================\n")
+
+        for module in modules:
+            filename = module.filename or "unknown"
+            if args.xml:
+                out.append(f"  <module_file module=\"{module.name.translate(_XML_ESCAPE)}\" file=\"{filename.translate(_XML_ESCAPE)}\"/>\n")
+            else:
+                out.append(f"  {module.name}: {filename}\n")
+
+        if args.xml:
+            out.append(" </module_files>\n")
+
+    # Show input files
+    if args.input_files:
+        if args.xml:
+            out.append(" <input_files>\n")
+        else:
+            out.append("\nInput Files:\n")
+            out.append("============\n")
+
+        for filename in args.files:
+            if args.xml:
+                out.append(f"  <file>{filename.translate(_XML_ESCAPE)}</file>\n")
+            else:
+                out.append(f"  {filename}\n")
+
+        if args.xml:
+            out.append(" </input_files>\n")
+
+    if args.xml:
+        out.append("</vhier>\n")
+
+    write_output(args.output, out)
+
+
+def _link_cache_path(files):
+    """Cache location for the linked design, or None if uncacheable
+
+    The key covers each input file's absolute path, mtime and size plus
+    the package version, so any source change or upgrade — which may
+    alter the pickled classes' layout — falls through to a fresh parse.
+    """
+    from verilog_python import __version__
+    try:
+        stamps = sorted((os.path.abspath(p), os.stat(p).st_mtime_ns,
+                         os.stat(p).st_size) for p in files)
+    except OSError:
+        return None
+    key = hashlib.blake2b(f"{__version__}|{stamps!r}".encode(),
+                          digest_size=20).hexdigest()
+    return Path.home() / '.cache' / 'vhier' / f'{key}.pkl'
+
+
+def _stamp_files(paths):
+    """Build (path, mtime_ns, size) stamps for the included headers"""
+    stamps = []
+    for path in sorted(paths):
+        stat = os.stat(path)
+        stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return stamps
+
+
+def _stamps_current(stamps):
+    """Check that every stamped file still matches on disk"""
+    for path, mtime_ns, size in stamps:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+            return False
+    return True
+
+
+def write_output(path, parts):
+    """Stream the assembled output chunks to the sink
+
+    writelines feeds the chunk list straight into a large-buffered file
+    object, so no second full-output-size string is ever allocated;
+    stdout encodes chunk by chunk into the binary buffer for the same
+    reason.
+    """
+    if path:
+        try:
+            with open(path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines(parts)
+        except Exception as e:
+            print(f"Error opening output file: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        sys.stdout.buffer.writelines(
+            chunk.encode('utf-8') for chunk in parts)
+        sys.stdout.buffer.flush()
+
+
+def show_hierarchy(parts, module, indent="", show_instance=False,
+                   xml=False, cache=None):
+    """Append the hierarchy text for a module to the parts list
+
+    Iterative with an explicit stack so deep hierarchies pay no per-node
+    frame allocation and cannot hit the recursion limit. Modules on the
+    current path are tracked so cyclic instantiations terminate instead
+    of looping forever.
+
+    Finished subtrees are memoized in cache by module identity, so a
+    module instantiated N times is formatted once and reindented N-1
+    times. Callers may share one cache across top modules; a cache is
+    only valid for a single show_instance/xml combination.
+    """
+    append = parts.append
+    active = set()
+    if cache is None:
+        cache = {}
+    # Frames: ('emit', text) appends text, ('finish', id, indent, start)
+    # exits a module and caches parts[start:], ('descend', module,
+    # indent) expands one. Children are pushed in reverse so pop order
+    # matches the original recursive DFS.
+    stack = [('descend', module, indent)]
+    while stack:
+        frame = stack.pop()
+        op = frame[0]
+        if op == 'emit':
+            append(frame[1])
+            continue
+        if op == 'finish':
+            _, mod_id, ind, start = frame
+            active.discard(mod_id)
+            block = ''.join(parts[start:])
+            if ind:
+                # Canonicalize to zero indent; every line in the block
+                # carries the uniform ind prefix, so strip exactly that
+                block = block.replace('\n' + ind, '\n')[len(ind):]
+            cache[mod_id] = block
+            continue
+
+        _, mod, ind = frame
+        mod_id = id(mod)
+        cached = cache.get(mod_id)
+        if cached is not None:
+            append(textwrap.indent(cached, ind) if ind else cached)
+            continue
+
+        start = len(parts)
+        if xml:
+            append(f"{ind}<module name=\"{mod.name.translate(_XML_ESCAPE)}\">\n")
+        else:
+            instance_info = f" ({mod.name})" if show_instance else ""
+            append(f"{ind}{mod.name}{instance_info}\n")
+
+        if mod_id in active:
+            # Cyclic instantiation: show the module but not its subtree
+            if xml:
+                append(f"{ind}</module>\n")
+            continue
+        active.add(mod_id)
+
+        stack.append(('finish', mod_id, ind, start))
+        if xml:
+            stack.append(('emit', f"{ind}</module>\n"))
+
+        # Hoist the per-level indent strings out of the cell loop so the
+        # concatenations happen once per module, not once per cell
+        cell_ind = ind + "  "
+        child_ind = ind + "    "
+        cell_close = f"{cell_ind}</cell>\n"
+        for cell_name, cell in reversed(mod.cells.items()):
+            if xml:
+                stack.append(('emit', cell_close))
+                if cell.module:
+                    stack.append(('descend', cell.module, child_ind))
+                stack.append(('emit', f"{cell_ind}<cell name=\"{cell_name.translate(_XML_ESCAPE)}\" module=\"{cell.module_name.translate(_XML_ESCAPE)}\">\n"))
+            elif show_instance:
+                if cell.module:
+                    stack.append(('descend', cell.module, child_ind))
+                stack.append(('emit', f"{cell_ind}{cell_name} ({cell.module_name})\n"))
+            else:
+                if cell.module:
+                    stack.append(('descend', cell.module, child_ind))
+                stack.append(('emit', f"{cell_ind}{cell_name}\n"))
+
+
+if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -1,127 +1,177 @@
-#!/usr/bin/env python3
-"""
-vppreproc - Verilog preprocessor
-
-This tool reads Verilog files and outputs preprocessed output,
-handling includes, defines, and other preprocessor directives.
-"""
-
-import sys
-import argparse
-from pathlib import Path
-
-# Add the parent directory to the path so we can import verilog_python
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
-from verilog_python import Preproc, Getopt
-
-
-def main():
-    """Main function for vppreproc tool"""
-    parser = argparse.ArgumentParser(
-        description="Preprocess Verilog files",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  vppreproc design.v
-  vppreproc -DDEBUG=1 design.v
-  vppreproc -I include_path design.v
-  vppreproc --defines-only design.v
-        """
-    )
-    
-    parser.add_argument('files', nargs='*', help='Verilog files to preprocess')
-    parser.add_argument('-D', '--define', action='append', help='Define macro')
-    parser.add_argument('-I', '--include', action='append', help='Include path')
-    parser.add_argument('--defines-only', action='store_true', help='Show only defines')
-    parser.add_argument('--includes-only', action='store_true', help='Show only includes')
-    parser.add_argument('--no-expand', action='store_true', help='Don\'t expand defines')
-    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
-    parser.add_argument('--debug', action='store_true', help='Enable debug output')
-    parser.add_argument('--version', action='version', version='vppreproc 1.0.0')
-    
-    args = parser.parse_args()
-    
-    # Handle file list from -f option (simplified)
-    if not args.files:
-        parser.error("No input files specified")
-    
-    # Create preprocessor
-    defines = {}
-    include_paths = []
-    
-    # Process defines
-    if args.define:
-        for define in args.define:
-            if '=' in define:
-                name, value = define.split('=', 1)
-                defines[name] = value
-            else:
-                defines[define] = '1'
-    
-    # Process include paths
-    if args.include:
-        include_paths.extend(args.include)
-    
-    preproc = Preproc(defines=defines, include_paths=include_paths)
-    
-    # Output handling
-    output_file = sys.stdout
-    if args.output:
-        try:
-            output_file = open(args.output, 'w')
-        except Exception as e:
-            print(f"Error opening output file: {e}", file=sys.stderr)
-            sys.exit(1)
-    
-    try:
-        # Show defines only
-        if args.defines_only:
-            output_file.write("Defines:\n")
-            output_file.write("========\n")
-            for name, value in preproc.get_defines().items():
-                output_file.write(f"`define {name} {value}\n")
-            return
-        
-        # Show includes only
-        if args.includes_only:
-            output_file.write("Include Paths:\n")
-            output_file.write("==============\n")
-            for path in include_paths:
-                output_file.write(f"  {path}\n")
-            return
-        
-        # Process files
-        for filename in args.files:
-            if args.debug:
-                print(f"Processing {filename}", file=sys.stderr)
-            
-            try:
-                # Read and preprocess the file
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if args.no_expand:
-                    # Just handle directives, don't expand defines
-                    processed_content = preproc.preprocess_stream(f, filename)
-                else:
-                    # Full preprocessing
-                    processed_content = preproc.preprocess_stream(f, filename)
-                
-                # Output the processed content
-                output_file.write(processed_content)
-                
-            except FileNotFoundError:
-                print(f"Error: File not found: {filename}", file=sys.stderr)
-                sys.exit(1)
-            except Exception as e:
-                print(f"Error processing {filename}: {e}", file=sys.stderr)
-                sys.exit(1)
-    
-    finally:
-        if args.output and output_file != sys.stdout:
-            output_file.close()
-
-
-if __name__ == '__main__':
+#!/usr/bin/env python3
+"""
+vppreproc - Verilog preprocessor
+
+This tool reads Verilog files and outputs preprocessed output,
+handling includes, defines, and other preprocessor directives.
+"""
+
+import sys
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Source-tree fallback: when running the script directly the package
+# is not installed, so put the repo root on the path. Installed entry
+# points import through the package and skip this.
+if 'verilog_python' not in sys.modules:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+
+def _read_source(filename):
+    """Read a source file as text in one bulk read"""
+    with open(filename, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+# Defaults mirrored from _build_parser for the no-flag fast path;
+# keep in sync when adding options
+_ARG_DEFAULTS = dict(
+    define=None, include=None, defines_only=False, includes_only=False,
+    no_expand=False, jobs=4, output=None, debug=False)
+
+
+def _parse_args():
+    """Parse argv, skipping argparse construction when no flags are given"""
+    argv = sys.argv[1:]
+    if argv and all(not arg.startswith('-') for arg in argv):
+        return argparse.Namespace(files=argv, **_ARG_DEFAULTS)
+    return _build_parser().parse_args()
+
+
+def _build_parser():
+    """Build the full argument parser (slow path)"""
+    parser = argparse.ArgumentParser(
+        description="Preprocess Verilog files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  vppreproc design.v
+  vppreproc -DDEBUG=1 design.v
+  vppreproc -I include_path design.v
+  vppreproc --defines-only design.v
+        """
+    )
+    
+    parser.add_argument('files', nargs='*', help='Verilog files to preprocess')
+    parser.add_argument('-D', '--define', action='append', help='Define macro')
+    parser.add_argument('-I', '--include', action='append', help='Include path')
+    parser.add_argument('--defines-only', action='store_true', help='Show only defines')
+    parser.add_argument('--includes-only', action='store_true', help='Show only includes')
+    parser.add_argument('--no-expand', action='store_true', help='Don\'t expand defines')
+    parser.add_argument('-j', '--jobs', type=int, default=4,
+                        help='Number of file reads to keep in flight (default: 4)')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--version', action='version', version='vppreproc 1.0.0')
+    return parser
+
+
+def main():
+    """Main function for vppreproc tool"""
+    args = _parse_args()
+
+    # Imported here so --help and --version skip the package import
+    from verilog_python import Preproc
+
+    # Handle file list from -f option (simplified)
+    if not args.files:
+        _build_parser().error("No input files specified")
+    
+    # Create preprocessor
+    defines = {}
+    include_paths = []
+    
+    # Process defines
+    if args.define:
+        for define in args.define:
+            if '=' in define:
+                name, value = define.split('=', 1)
+                defines[name] = value
+            else:
+                defines[define] = '1'
+    
+    # Process include paths
+    if args.include:
+        include_paths.extend(args.include)
+    
+    preproc = Preproc(defines=defines, include_paths=include_paths)
+    
+    # Output handling: files get a text handle, stdout takes the binary
+    # buffer so each chunk is encoded in one pass instead of per write
+    # through the TextIOWrapper
+    output_file = None
+    if args.output:
+        try:
+            output_file = open(args.output, 'w', encoding='utf-8')
+            out_write = output_file.write
+        except Exception as e:
+            print(f"Error opening output file: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        stdout_buffer = sys.stdout.buffer
+        out_write = lambda text: stdout_buffer.write(text.encode('utf-8'))
+
+    try:
+        # Show defines only
+        if args.defines_only:
+            out_write("Defines:\n")
+            out_write("========\n")
+            for name, value in preproc.get_defines().items():
+                out_write(f"`define {name} {value}\n")
+            return
+        
+        # Show includes only
+        if args.includes_only:
+            out_write("Include Paths:\n")
+            out_write("==============\n")
+            for path in include_paths:
+                out_write(f"  {path}\n")
+            return
+        
+        # Process files
+        # Reads are prefetched on worker threads so disk latency for
+        # the next files overlaps preprocessing of the current one; the
+        # window is bounded by --jobs so long file lists are not all
+        # held in memory at once. Results are consumed in command-line
+        # order, keeping the output and the shared define state
+        # deterministic.
+        jobs = max(1, args.jobs)
+        names = iter(args.files)
+        with ThreadPoolExecutor(max_workers=min(jobs, len(args.files))) as pool:
+            pending = deque(
+                (filename, pool.submit(_read_source, filename))
+                for filename in itertools.islice(names, jobs + 1))
+            while pending:
+                filename, future = pending.popleft()
+                for refill in itertools.islice(names, 1):
+                    pending.append((refill, pool.submit(_read_source, refill)))
+
+                if args.debug:
+                    print(f"Processing {filename}", file=sys.stderr)
+
+                try:
+                    processed_content = preproc.preprocess_text(
+                        future.result(), filename)
+
+                    # Output the processed content
+                    out_write(processed_content)
+
+                except FileNotFoundError:
+                    print(f"Error: File not found: {filename}", file=sys.stderr)
+                    sys.exit(1)
+                except Exception as e:
+                    print(f"Error processing {filename}: {e}", file=sys.stderr)
+                    sys.exit(1)
+    
+    finally:
+        if output_file is not None:
+            output_file.close()
+        else:
+            sys.stdout.buffer.flush()
+
+
+if __name__ == '__main__':
     main() 
\ No newline at end of file